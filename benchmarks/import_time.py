@@ -0,0 +1,189 @@
+"""
+Cold start import-time check, based on python -X importtime.
+
+Imports each entry module in a fresh interpreter (run from an empty directory,
+so no data or cache files are touched) and fails when:
+- the module can't be imported,
+- a module of the downloader stack gets imported at startup,
+- the import takes more than a set multiple of the interpreter's own startup
+  imports, a budget that holds on any machine, or
+- the import got slower than the recorded baseline plus a tolerance.
+
+Usage:
+    python benchmarks/import_time.py            # check
+    python benchmarks/import_time.py --update   # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "import_time_baseline.json"
+
+# Entry modules and the packages they must not pull in at import time
+ENTRY_MODULES = {
+    "src.gui.main_window": ("spotdl", "spotipy", "yt_dlp", "requests"),
+    "src.cli": ("spotdl", "spotipy", "yt_dlp", "requests", "PySide6"),
+}
+
+# Most an import may take, as a multiple of the imports done by `python -c pass`.
+# Measured with PySide6 6.12 the GUI ranges from 28x to 44x and the CLI from 3x
+# to 5x between runs, the budgets leave room for that spread
+STARTUP_RATIO_BUDGETS = {
+    "src.gui.main_window": 60.0,
+    "src.cli": 8.0,
+}
+
+# Baseline entry holding the `python -c pass` imports it was recorded against
+STARTUP_KEY = "python -c pass"
+
+RUNS = 5
+# Relative slowdown tolerated before failing, import times are noisy
+TOLERANCE = 0.20
+
+
+def _import_times(code: str) -> list[tuple[int, str]]:
+    """(cumulative us, indented name) of every import done by the code"""
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=work_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise RuntimeError(f"import failed ({error[0]})")
+
+    times = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+
+        times.append((int(parts[1]), parts[2].rstrip()))
+
+    return times
+
+
+def measure_startup() -> float:
+    """Time in ms of the imports every interpreter does before running any code"""
+    # Top level imports are indented by a single space, their cumulative
+    # times already include everything they import
+    return (
+        sum(
+            us
+            for us, name in _import_times("pass")
+            if name.startswith(" ") and not name.startswith("  ")
+        )
+        / 1000
+    )
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    """Cumulative import time of the module in ms, and every imported package"""
+    cumulative_us = None
+    imported = set()
+    for us, name in _import_times(f"import {module}"):
+        name = name.strip()
+        imported.add(name.split(".")[0])
+        if name == module:
+            cumulative_us = us
+
+    if cumulative_us is None:
+        raise RuntimeError(f"No import time reported for {module}")
+
+    return cumulative_us / 1000, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--update", action="store_true", help="record a new baseline"
+    )
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args()
+
+    try:
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        baseline = {}
+
+    failed = False
+    runs = max(1, args.runs)
+    startup_ms = min(measure_startup() for _ in range(runs))
+    timings = {STARTUP_KEY: round(startup_ms, 1)}
+
+    # A loaded or slower machine slows the interpreter's own imports alike, the
+    # baseline is scaled by them so it keeps meaning the same on another run
+    baseline_startup_ms = baseline.get(STARTUP_KEY)
+    scale = startup_ms / baseline_startup_ms if baseline_startup_ms else 1.0
+
+    for module, forbidden in ENTRY_MODULES.items():
+        try:
+            # The fastest run is the least disturbed by the rest of the machine
+            samples = [measure(module) for _ in range(runs)]
+        except RuntimeError as e:
+            failed = True
+            print(f"FAIL {module}: {e}")
+            continue
+
+        best_ms = min(ms for ms, _ in samples)
+        imported = samples[0][1]
+        timings[module] = round(best_ms, 1)
+
+        eager = sorted(set(forbidden) & imported)
+        if eager:
+            failed = True
+            print(f"FAIL {module}: imports {', '.join(eager)} at startup")
+
+        ratio = best_ms / startup_ms if startup_ms else 0.0
+        max_ratio = STARTUP_RATIO_BUDGETS.get(module)
+        if max_ratio is not None and ratio > max_ratio:
+            failed = True
+            print(
+                f"FAIL {module}: {best_ms:.1f} ms, {ratio:.1f}x the interpreter "
+                f"startup ({startup_ms:.1f} ms), budget {max_ratio:.0f}x"
+            )
+
+        budget_ms = baseline.get(module)
+        if budget_ms is None:
+            print(
+                f"INFO {module}: {best_ms:.1f} ms, {ratio:.1f}x the interpreter "
+                "startup (no baseline recorded)"
+            )
+        elif best_ms > budget_ms * scale * (1 + TOLERANCE):
+            failed = True
+            print(
+                f"FAIL {module}: {best_ms:.1f} ms, baseline {budget_ms * scale:.1f} ms"
+            )
+        else:
+            print(
+                f"OK   {module}: {best_ms:.1f} ms, baseline {budget_ms * scale:.1f} ms"
+            )
+
+    if args.update:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({**baseline, **timings}, f, indent=4)
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Headless entry point: python -m src <command>
+
+Drives the same sync and search logic as the GUI through plain callbacks and
+never imports PySide6, so it can run from cron on a machine without a display.
+"""
+
+import argparse
+from threading import Event
+from src.utils.config_manager import CONFIG, PlaylistData
+from src.utils.song_cache import SONG_CACHE
+
+
+def _print_progress(message: list[str]):
+    print(" | ".join(message))
+
+
+def list_playlists(_: argparse.Namespace) -> int:
+    playlists = CONFIG.get_ordered_playlists()
+    if not playlists:
+        print("No saved playlists")
+        return 0
+
+    for index, playlist in enumerate(playlists):
+        enabled = "x" if playlist.get("enabled") else " "
+        print(
+            f"{index + 1:>4}. [{enabled}] {playlist.get('id')}  "
+            f"{playlist.get('title')} ({playlist.get('total_tracks')} tracks)"
+        )
+    return 0
+
+
+def sync(args: argparse.Namespace) -> int:
+    if args.all == bool(args.ids):
+        print("Pass either --all or one or more playlist ids")
+        return 2
+
+    # The downloader stack is only loaded by the commands that need it
+    from src.logic.sync_scheduler import sync_playlist, sync_playlists
+
+    cancel_event = Event()
+    try:
+        if args.all:
+            sync_playlists(
+                CONFIG.get_enabled_playlists(), _print_progress, cancel_event
+            )
+            return 0
+
+        playlists: list[PlaylistData] = []
+        for p_id in args.ids:
+            playlist = CONFIG.get_playlist(p_id)
+            if playlist is None:
+                print(f"Playlist with id {p_id} is not on the list")
+                return 1
+            playlists.append(playlist)
+
+        for index, playlist in enumerate(playlists):
+            sync_playlist(
+                playlist, len(playlists), index + 1, _print_progress, cancel_event
+            )
+        return 0
+    except KeyboardInterrupt:
+        cancel_event.set()
+        print("Sync cancelled")
+        return 130
+    finally:
+        SONG_CACHE.save()
+
+
+def daemon(_: argparse.Namespace) -> int:
+    from src.logic.sync_daemon import SyncDaemon
+
+    stop_event = Event()
+    print("Sync daemon started, press Ctrl+C to stop")
+    try:
+        SyncDaemon(_print_progress, stop_event).run()
+    except KeyboardInterrupt:
+        print("Sync daemon stopped")
+    return 0
+
+
+def set_interval(args: argparse.Namespace) -> int:
+    if args.minutes < 0 or (not args.ids and args.minutes == 0):
+        print("The interval must be a positive amount of minutes")
+        return 2
+
+    if not args.ids:
+        CONFIG.set_sync_interval(args.minutes)
+        return 0
+
+    for p_id in args.ids:
+        if CONFIG.get_playlist(p_id) is None:
+            print(f"Playlist with id {p_id} is not on the list")
+            return 1
+        CONFIG.set_playlist_sync_interval(p_id, args.minutes)
+    return 0
+
+
+def search(args: argparse.Namespace) -> int:
+    from src.logic.spotdl_commands import get_user_playlists
+
+    found: list[PlaylistData] = []
+    get_user_playlists(
+        args.user,
+        lambda playlist, _: found.append(playlist),
+        lambda _: None,
+    )
+
+    for playlist in found:
+        print(
+            f"{playlist.get('id')}  {playlist.get('title')} "
+            f"({playlist.get('total_tracks')} tracks)"
+        )
+
+    print(f"Found {len(found)} playlists for user '{args.user}'")
+    return 0 if found else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src", description="Sync saved Spotify playlists headlessly"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = commands.add_parser("sync", help="download missing tracks")
+    sync_parser.add_argument("ids", nargs="*", help="ids of the playlists to sync")
+    sync_parser.add_argument(
+        "--all", action="store_true", help="sync every enabled playlist"
+    )
+    sync_parser.set_defaults(handler=sync)
+
+    daemon_parser = commands.add_parser(
+        "daemon", help="keep the enabled playlists synced on their intervals"
+    )
+    daemon_parser.set_defaults(handler=daemon)
+
+    interval_parser = commands.add_parser(
+        "interval", help="set the minutes between daemon syncs"
+    )
+    interval_parser.add_argument(
+        "minutes", type=int, help="0 makes the playlists use the default again"
+    )
+    interval_parser.add_argument(
+        "ids", nargs="*", help="playlists to set it for, the default if none"
+    )
+    interval_parser.set_defaults(handler=set_interval)
+
+    search_parser = commands.add_parser("search", help="list a user's playlists")
+    search_parser.add_argument("user", help="Spotify user id")
+    search_parser.set_defaults(handler=search)
+
+    list_parser = commands.add_parser("list", help="list the saved playlists")
+    list_parser.set_defaults(handler=list_playlists)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
@@ -7,7 +7,6 @@ from src.gui.views.config_view import ConfigView
 from src.gui.views.manage_view import ManageView
 from src.gui.widgets.loading_overlay import LoadingIndicator
 from src.gui.widgets.toast_popup import ToastPopUp
-from src.utils.card_shared_worker import CARD_SHARED_WORKER
 
 
 class MainWindow(QtWidgets.QWidget):
@@ -49,6 +48,10 @@ class MainWindow(QtWidgets.QWidget):
 
         main_layout.addWidget(tab_widget)
 
+    def closeEvent(self, event: QtGui.QCloseEvent):
+        self.manage_view.save_startup_snapshot()
+        super().closeEvent(event)
+
     def resizeEvent(self, event: QtGui.QResizeEvent):
         self.loading_overlay.resize(self.size())
         self.loading_overlay.move(0, 0)
@@ -57,14 +60,5 @@ class MainWindow(QtWidgets.QWidget):
 
     @QtCore.Slot()
     def cancel_process(self):
-        if self.manage_view.worker:
-            self.manage_view.worker.cancel()
-            print(">> Cancelling manage_view worker <<")
-
-        if self.add_view.add_worker:
-            self.add_view.add_worker.cancel()
-            print(">> Cancelling add_view worker <<")
-
-        if CARD_SHARED_WORKER.shared_worker:
-            CARD_SHARED_WORKER.shared_worker.cancel()
-            print(">> Cancelling playlist_card worker <<")
+        self.manage_view.cancel_syncs()
+        print(">> Cancelling manage_view syncs <<")
@@ -1,11 +1,11 @@
 import threading
+from functools import partial
 from src.gui.widgets.loading_overlay import LoadingIndicator
 from PySide6 import QtCore, QtGui, QtWidgets
-from src.gui.widgets.playlist_card import PlaylistCard
 from src.gui.widgets.scroll_playlists_container import ScrollPlaylistsContainer
 from src.logic.spotdl_commands import get_user_playlists
 from src.utils.config_manager import CONFIG, PlaylistData
-from src.utils.utils import cleanup_thread
+from src.utils.task_executor import TASKS, TaskHandle, TaskPriority
 
 
 class AddView(QtWidgets.QWidget):
@@ -14,11 +14,11 @@ class AddView(QtWidgets.QWidget):
     def __init__(self):
         super().__init__()
 
-        self._search_logic_thread = None
-        self.search_worker = None
+        self.search_worker: SearchPlaylistsWorker | None = None
+        self._search_task: TaskHandle | None = None
 
-        self._add_logic_thread = None
-        self.add_worker = None
+        # Workers are referenced until they finish so their queued signals land
+        self._add_workers: list[AddPlaylistToCollectionWorker] = []
 
         self.main_layout = QtWidgets.QVBoxLayout(self)
 
@@ -63,56 +63,69 @@ class AddView(QtWidgets.QWidget):
         self.main_layout.addLayout(input_layout)
 
         # Playlist scroll list
-        self.scroll_playlists_container = ScrollPlaylistsContainer()
+        self.scroll_playlists_container = ScrollPlaylistsContainer("search")
+        self.scroll_playlists_container.on_add_playlist.connect(
+            self._add_playlist_to_collection
+        )
         self.main_layout.addWidget(self.scroll_playlists_container)
 
         self._search_user_playlists("default")
 
     @QtCore.Slot(str)
     def _search_user_playlists(self, username: str):
-        if self._search_logic_thread and self._search_logic_thread.isRunning():
-            print("Can't search playlists, logic thread is currently busy")
-            return
-
-        self._search_logic_thread = QtCore.QThread()
-        self.search_worker = SearchPlaylistsWorker(username)
+        # A new search replaces the one still running
+        self.cancel_search()
 
-        self.search_worker.moveToThread(self._search_logic_thread)
-
-        self._search_logic_thread.started.connect(self.search_worker.run)
-        self._search_logic_thread.finished.connect(
-            lambda: cleanup_thread(self, "search_worker", "_search_logic_thread")
-        )
+        worker = SearchPlaylistsWorker(username)
+        self.search_worker = worker
 
-        self.search_worker.finished.connect(self._search_logic_thread.quit)
-
-        # Custom Signals
-        self.search_worker.updated_username.connect(self._update_username)
-        self.search_worker.found_playlist.connect(self._add_search_playlist_card)
-        self.search_worker.progress.connect(
-            self.search_playlist_loading_indicator.set_message
-        )
-        self.search_worker.finished.connect(self.search_playlist_loading_indicator.hide)
+        # Custom Signals, results of a replaced search are ignored
+        worker.updated_username.connect(self._update_username)
+        worker.found_playlist.connect(partial(self._add_search_playlist_card, worker))
+        worker.found_cover.connect(partial(self._set_search_playlist_cover, worker))
+        worker.progress.connect(partial(self._set_search_progress, worker))
+        worker.finished.connect(partial(self._on_search_finished, worker))
 
         self.scroll_playlists_container.reset_playlist_layout()
         self.search_playlist_loading_indicator.show()
-        self._search_logic_thread.start()
+
+        self._search_task = TASKS.submit(
+            worker.run,
+            name=f"search {username}",
+            priority=TaskPriority.HIGH,
+            on_cancel=worker.cancel,
+            on_skipped=worker.finished.emit,
+        )
 
     @QtCore.Slot()
     def cancel_search(self):
-        if self.search_worker is not None:
-            self.search_worker.cancel()
+        if self._search_task is not None:
+            self._search_task.cancel()
+
+    def _add_search_playlist_card(
+        self,
+        worker: "SearchPlaylistsWorker",
+        new_playlist: PlaylistData,
+        cover_bytes: bytes,
+    ):
+        if worker is self.search_worker:
+            self.scroll_playlists_container.add_playlist(new_playlist, cover_bytes)
 
-    @QtCore.Slot(dict)
-    def _add_search_playlist_card(self, new_playlist: PlaylistData, cover_bytes: bytes):
-        if not self.scroll_playlists_container:
-            return
+    def _set_search_playlist_cover(
+        self, worker: "SearchPlaylistsWorker", p_id: str, cover_bytes: bytes
+    ):
+        if worker is self.search_worker:
+            self.scroll_playlists_container.set_playlist_cover(p_id, cover_bytes)
 
-        callback = self.scroll_playlists_container.change_playlist_priority
+    def _set_search_progress(self, worker: "SearchPlaylistsWorker", message: list):
+        if worker is self.search_worker:
+            self.search_playlist_loading_indicator.set_message(message)
 
-        playlist_card = PlaylistCard("search", new_playlist, cover_bytes, callback)
-        playlist_card.on_add_playlist.connect(self._add_playlist_to_collection)
-        self.scroll_playlists_container.add_playlist_card(playlist_card)
+    def _on_search_finished(self, worker: "SearchPlaylistsWorker"):
+        if worker is self.search_worker:
+            self.search_worker = None
+            self._search_task = None
+            self.search_playlist_loading_indicator.hide()
 
     @QtCore.Slot(str)
     def _update_username(self, new_username: str):
@@ -122,33 +135,28 @@ class AddView(QtWidgets.QWidget):
     def _add_playlist_to_collection(
         self, new_playlist: PlaylistData, cover_bytes: bytes
     ):
-        if self._add_logic_thread and self._add_logic_thread.isRunning():
-            print("Can't add plylist, logic thread is currently busy")
-            return
-
-        self._add_logic_thread = QtCore.QThread()
-        self.add_worker = AddPlaylistToCollectionWorker(new_playlist, cover_bytes)
-
-        self.add_worker.moveToThread(self._add_logic_thread)
-
-        self._add_logic_thread.started.connect(self.add_worker.run)
-        self._add_logic_thread.finished.connect(
-            lambda: cleanup_thread(self, "add_worker", "_add_logic_thread")
-        )
-
-        self.add_worker.finished.connect(self._add_logic_thread.quit)
+        worker = AddPlaylistToCollectionWorker(new_playlist, cover_bytes)
+        self._add_workers.append(worker)
 
         # Custom Signals
-        self.add_worker.added_playlist_to_collection.connect(
-            self.playlist_added_to_list.emit
+        worker.added_playlist_to_collection.connect(self.playlist_added_to_list.emit)
+        worker.finished.connect(lambda: self._forget_add_worker(worker))
+
+        TASKS.submit(
+            worker.run,
+            name=f"add playlist {new_playlist.get('id')}",
+            priority=TaskPriority.HIGH,
         )
 
-        self._add_logic_thread.start()
+    def _forget_add_worker(self, worker: "AddPlaylistToCollectionWorker"):
+        if worker in self._add_workers:
+            self._add_workers.remove(worker)
 
 
 class SearchPlaylistsWorker(QtCore.QObject):
     updated_username = QtCore.Signal(str)
     found_playlist = QtCore.Signal(PlaylistData, bytes)
+    found_cover = QtCore.Signal(str, bytes)
     progress = QtCore.Signal(list)
     finished = QtCore.Signal()
 
@@ -183,7 +191,11 @@ class SearchPlaylistsWorker(QtCore.QObject):
                 return
 
             get_user_playlists(
-                self.username, self.found_playlist, self.progress, self.cancel_event
+                self.username,
+                self.found_playlist.emit,
+                self.progress.emit,
+                self.cancel_event,
+                self.found_cover.emit,
             )
         except:
             pass
@@ -206,24 +218,14 @@ class AddPlaylistToCollectionWorker(QtCore.QObject):
 
     def run(self):
         try:
-            current_playlists = CONFIG.get_all_playlists()
-
             p_id = self.new_playlist.get("id")
+            self.new_playlist["enabled"] = True
 
-            if current_playlists is None:
-                print("Unable to add playlists: Non existent key on json file")
-                self.finished.emit()
-                return
-
-            if p_id in current_playlists:
+            # Checked and saved at once, two quick clicks must not add it twice
+            if not CONFIG.add_playlist(self.new_playlist):
                 print(f"Playlist with id {p_id} is already present on list")
-                self.finished.emit()
                 return
 
-            self.new_playlist["enabled"] = True
-
-            CONFIG.set_playlist(self.new_playlist)
-
             self.added_playlist_to_collection.emit(self.new_playlist, self.cover_bytes)
         except Exception as e:
             print(f"Error while adding playlist to collection: {e}")
@@ -46,6 +46,42 @@ class ConfigView(QtWidgets.QWidget):
 
         content_layout.addWidget(self.error_container)
 
+        workers_row = QtWidgets.QHBoxLayout()
+        workers_row.addWidget(QtWidgets.QLabel("Parallel downloads:"))
+
+        self.workers_sb = QtWidgets.QSpinBox()
+        self.workers_sb.setRange(1, 16)
+        self.workers_sb.setValue(CONFIG.get_download_workers())
+        self.workers_sb.valueChanged.connect(CONFIG.set_download_workers)
+        workers_row.addWidget(self.workers_sb)
+        content_layout.addLayout(workers_row)
+
+        playlists_row = QtWidgets.QHBoxLayout()
+        playlists_row.addWidget(QtWidgets.QLabel("Playlists synced at once:"))
+
+        self.playlists_sb = QtWidgets.QSpinBox()
+        self.playlists_sb.setRange(1, 16)
+        self.playlists_sb.setValue(CONFIG.get_max_concurrent_playlists())
+        self.playlists_sb.valueChanged.connect(CONFIG.set_max_concurrent_playlists)
+        playlists_row.addWidget(self.playlists_sb)
+        content_layout.addLayout(playlists_row)
+
+        self.library_cb = QtWidgets.QCheckBox(
+            "Share tracks between playlists (download each song once)"
+        )
+        self.library_cb.setChecked(CONFIG.get_library_mode())
+        self.library_cb.toggled.connect(CONFIG.set_library_mode)
+        content_layout.addWidget(self.library_cb)
+
+        self.sqlite_cb = QtWidgets.QCheckBox(
+            "Store playlists in SQLite (for very large libraries)"
+        )
+        self.sqlite_cb.setChecked(CONFIG.get_storage_backend() == "sqlite")
+        self.sqlite_cb.toggled.connect(
+            lambda checked: CONFIG.set_storage_backend("sqlite" if checked else "json")
+        )
+        content_layout.addWidget(self.sqlite_cb)
+
         outer_layout.addWidget(content_widget)
 
         outer_layout.addStretch()
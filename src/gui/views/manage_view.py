@@ -1,14 +1,26 @@
 import os
 import threading
-import requests
+import time
+from collections import deque
 from PySide6 import QtCore, QtGui, QtWidgets
 from src.gui.widgets.loading_overlay import LoadingIndicator
-from src.gui.widgets.playlist_card import PlaylistCard
+from src.gui.widgets.playlist_card import SyncPlaylistsWorker
+from src.gui.widgets.playlist_list_model import DISPLAYED_FIELDS
 from src.gui.widgets.scroll_playlists_container import ScrollPlaylistsContainer
-from src.logic.spotdl_commands import syncPlaylist
+from src.logic.sync_scheduler import sync_playlists
 from src.utils.cache_manager import CACHE
 from src.utils.config_manager import CONFIG, PlaylistData
-from src.utils.utils import cleanup_thread
+from src.utils.http_session import fetch_bytes
+from src.utils.startup_snapshot import StartupSnapshot, save_startup_snapshot
+from src.utils.task_executor import SYNC_TASKS, TASKS, TaskHandle, TaskPriority
+
+# Playlists sent to the GUI thread per signal while loading the saved ones
+LOAD_BATCH_SIZE = 250
+# Time the GUI thread spends inserting rows before letting a frame through
+INSERT_BUDGET_MS = 8
+INSERT_CHUNK_SIZE = 50
+# Covers of the rows on the first screen, read from the pack in a single pass
+PREFETCH_COVER_ROWS = 32
 
 
 # TODO: MANUALLY ADD BY URL
@@ -30,10 +42,18 @@ class ManageView(QtWidgets.QWidget):
     def __init__(self):
         super().__init__()
 
-        self.playlist_cards = []
+        # Workers are referenced until they finish so their queued signals land
+        self._load_worker: ParsePlaylistsWorker | None = None
+        self._load_task: TaskHandle | None = None
+        # Queued or running syncs, by playlist id or "all" for Sync All
+        self._sync_workers: dict[str, SyncAllPlaylistsWorker | SyncPlaylistsWorker] = {}
+        self._sync_tasks: dict[str, TaskHandle] = {}
 
-        self._logic_thread = None
-        self.worker = None
+        # Loaded playlists waiting to be inserted, a chunk per event loop pass
+        self._pending_playlists: deque[tuple[PlaylistData, bytes]] = deque()
+        self._insert_timer = QtCore.QTimer(self)
+        self._insert_timer.setInterval(0)
+        self._insert_timer.timeout.connect(self._insert_pending_playlists)
 
         main_layout = QtWidgets.QVBoxLayout(self)
 
@@ -54,7 +74,8 @@ class ManageView(QtWidgets.QWidget):
         main_layout.addWidget(self.parse_playlist_loading_indicator)
 
         # Main container
-        self.scroll_playlists_container = ScrollPlaylistsContainer()
+        self.scroll_playlists_container = ScrollPlaylistsContainer("manage")
+        self.scroll_playlists_container.on_sync_playlist.connect(self._sync_playlist)
         main_layout.addWidget(self.scroll_playlists_container)
 
         # Footer
@@ -85,92 +106,150 @@ class ManageView(QtWidgets.QWidget):
         self.parse_playlists()
 
     def parse_playlists(self):
-        if self._logic_thread and self._logic_thread.isRunning():
-            print("Can't parse playlists, logic thread is currently busy")
+        if self._load_task and not self._load_task.done:
+            print("Saved playlists are already being loaded")
             return
 
-        self._logic_thread = QtCore.QThread()
-        self.worker = ParsePlaylistsWorker()
-
-        self.worker.moveToThread(self._logic_thread)
+        # Rows shown on exit are painted right away, the worker then reconciles
+        snapshot = StartupSnapshot.load()
+        snapshot_rows = None
+        atlas_ids: set[str] = set()
+        if snapshot is not None:
+            snapshot.load_thumbnails()
+            snapshot_rows = snapshot.rows
+            atlas_ids = set(snapshot.atlas_slots)
+            self._queue_playlists([(row, bytes()) for row in snapshot_rows])
 
-        self._logic_thread.started.connect(self.worker.run)
-        self._logic_thread.finished.connect(
-            lambda: cleanup_thread(self, "worker", "_logic_thread")
-        )
-
-        self.worker.finished.connect(self._logic_thread.quit)
+        worker = ParsePlaylistsWorker(snapshot_rows, atlas_ids)
+        self._load_worker = worker
 
         # Custom Signals
-        self.worker.on_add_playlist.connect(self.add_playlist_card)
-        self.worker.progress.connect(self.parse_playlist_loading_indicator.set_message)
-        self.worker.finished.connect(
-            lambda: self.parse_playlist_loading_indicator.hide()
+        worker.on_reset_playlists.connect(self._reset_playlists)
+        worker.on_add_playlists.connect(self._queue_playlists)
+        worker.on_update_playlists.connect(self._update_playlists)
+        worker.on_remove_playlists.connect(self._remove_playlists)
+        worker.found_cover.connect(self.scroll_playlists_container.set_playlist_cover)
+        worker.progress.connect(self.parse_playlist_loading_indicator.set_message)
+        worker.finished.connect(self.parse_playlist_loading_indicator.hide)
+
+        self._load_task = TASKS.submit(
+            worker.run,
+            name="load playlists",
+            priority=TaskPriority.HIGH,
+            on_skipped=worker.finished.emit,
         )
-
-        self._logic_thread.start()
         self.parse_playlist_loading_indicator.show()
 
     @QtCore.Slot()
     def toggle_all_playlist(self, enabled: bool):
-        for card in self.playlist_cards:
-            if isinstance(card, PlaylistCard):
-                card.toggle_playlist(enabled)
+        self.scroll_playlists_container.set_all_enabled(enabled)
 
     @QtCore.Slot()
     def sync_all_playlists(self):
-        if self._logic_thread and self._logic_thread.isRunning():
-            print(
-                "Can't sync all playlists, another logic thread is already running in the manage_view"
-            )
-            return
+        self._submit_sync("all", SyncAllPlaylistsWorker(), TaskPriority.LOW)
 
-        self._logic_thread = QtCore.QThread()
+    @QtCore.Slot(PlaylistData)
+    def _sync_playlist(self, playlist: PlaylistData):
+        self._submit_sync(
+            playlist.get("id"), SyncPlaylistsWorker(playlist), TaskPriority.NORMAL
+        )
 
-        self.worker = SyncAllPlaylistsWorker()
+    def _submit_sync(
+        self,
+        key: str,
+        worker: "SyncAllPlaylistsWorker | SyncPlaylistsWorker",
+        priority: TaskPriority,
+    ):
+        task = self._sync_tasks.get(key)
+        if task and not task.done:
+            print(f"Sync of '{key}' is already queued or running")
+            return
 
-        self.worker.moveToThread(self._logic_thread)
+        # The overlay stays up until the last of the running syncs finishes
+        if not self._sync_tasks:
+            self.on_process_start.emit()
 
-        self._logic_thread.started.connect(self.worker.run)
-        self._logic_thread.finished.connect(
-            lambda: cleanup_thread(self, "worker", "_logic_thread")
+        # Custom Signals
+        worker.progress.connect(self.on_update_progress.emit)
+        worker.finished.connect(lambda: self._on_sync_finished(key))
+
+        self._sync_workers[key] = worker
+        self._sync_tasks[key] = SYNC_TASKS.submit(
+            worker.run,
+            name=f"sync {key}",
+            priority=priority,
+            on_cancel=worker.cancel,
+            on_skipped=worker.finished.emit,
         )
 
-        self.worker.finished.connect(self._logic_thread.quit)
-
-        # Custom Signals
-        self.worker.progress.connect(self.on_update_progress.emit)
-        self.worker.finished.connect(self.on_process_finish.emit)
+    def _on_sync_finished(self, key: str):
+        self._sync_workers.pop(key, None)
+        self._sync_tasks.pop(key, None)
+        if not self._sync_tasks:
+            self.on_process_finish.emit()
 
-        self._logic_thread.start()
-        self.on_process_start.emit()
+    @QtCore.Slot()
+    def cancel_syncs(self):
+        for task in list(self._sync_tasks.values()):
+            task.cancel()
 
     @QtCore.Slot(PlaylistData, bytes)
     def add_playlist_card(self, new_playlist: PlaylistData, cover_bytes: bytes):
-        callback = self.scroll_playlists_container.change_playlist_priority
+        # New playlists are already placed last by CONFIG.set_playlist
+        CACHE.save_cover(cover_bytes, new_playlist.get("id"))
+        self.scroll_playlists_container.add_playlist(new_playlist, cover_bytes)
+
+    @QtCore.Slot(list)
+    def _queue_playlists(self, playlists: list[tuple[PlaylistData, bytes]]):
+        self._pending_playlists.extend(playlists)
+        if not self._insert_timer.isActive():
+            self._insert_timer.start()
 
-        new_card = PlaylistCard(
-            "manage",
-            new_playlist,
-            cover_bytes,
-            callback,
+    @QtCore.Slot()
+    def _reset_playlists(self):
+        self._pending_playlists.clear()
+        self.scroll_playlists_container.reset_playlist_layout()
+
+    @QtCore.Slot(list)
+    def _update_playlists(self, playlists: list[PlaylistData]):
+        updates = {playlist.get("id"): playlist for playlist in playlists}
+
+        # Snapshot rows still waiting to be inserted take the new data directly
+        pending = deque()
+        for playlist, cover_bytes in self._pending_playlists:
+            pending.append((updates.pop(playlist.get("id"), playlist), cover_bytes))
+        self._pending_playlists = pending
+
+        for playlist in updates.values():
+            self.scroll_playlists_container.update_playlist(playlist)
+
+    @QtCore.Slot(list)
+    def _remove_playlists(self, p_ids: list[str]):
+        removed_ids = set(p_ids)
+        self._pending_playlists = deque(
+            item
+            for item in self._pending_playlists
+            if item[0].get("id") not in removed_ids
         )
 
-        p_id = new_playlist.get("id")
-        CACHE.save_cover(cover_bytes, p_id)
+        for p_id in removed_ids:
+            self.scroll_playlists_container.remove_playlist_row(p_id)
+
+    @QtCore.Slot()
+    def _insert_pending_playlists(self):
+        deadline = time.perf_counter() + INSERT_BUDGET_MS / 1000
 
-        new_card.on_sync_start.connect(self.on_process_start.emit)
-        new_card.on_sync_progress_update.connect(self.on_update_progress.emit)
-        new_card.on_sync_finish.connect(self.on_process_finish.emit)
+        while self._pending_playlists and time.perf_counter() < deadline:
+            chunk_size = min(INSERT_CHUNK_SIZE, len(self._pending_playlists))
+            chunk = [self._pending_playlists.popleft() for _ in range(chunk_size)]
+            self.scroll_playlists_container.add_playlists(chunk)
 
-        new_card.on_delete.connect(
-            lambda card=new_card: self.playlist_cards.remove(card)
-        )
-        self.playlist_cards.append(new_card)
-        insertion_index = self.scroll_playlists_container.add_playlist_card(new_card)
+        if not self._pending_playlists:
+            self._insert_timer.stop()
 
-        if insertion_index is not None:
-            CONFIG.set_playlist_priority(p_id, insertion_index)
+    def save_startup_snapshot(self):
+        # Saved from the config, the rows may still be loading or hold stale data
+        save_startup_snapshot(CONFIG.get_ordered_playlists())
 
     @QtCore.Slot()
     def open_playlists_folder(self):
@@ -191,26 +270,11 @@ class SyncAllPlaylistsWorker(QtCore.QObject):
 
     def run(self):
         try:
-            amount = sum(
-                playlist.get("enabled", False)
-                for playlist in CONFIG.get_all_playlists().values()
+            sync_playlists(
+                CONFIG.get_enabled_playlists(),
+                self.progress.emit,
+                self.cancel_event,
             )
-
-            index = 0
-
-            for current_playlist in CONFIG.get_all_playlists().values():
-                if self.cancel_event and self.cancel_event.is_set():
-                    return
-
-                if current_playlist.get("enabled"):
-                    index += 1
-                    syncPlaylist(
-                        current_playlist,
-                        amount,
-                        index,
-                        self.progress,
-                        self.cancel_event,
-                    )
         except Exception as e:
             print(f"An unexpected error occurred during playlist sync: {e}")
         finally:
@@ -220,10 +284,21 @@ class SyncAllPlaylistsWorker(QtCore.QObject):
 class ParsePlaylistsWorker(QtCore.QObject):
     finished = QtCore.Signal()
     progress = QtCore.Signal(list)
-    on_add_playlist = QtCore.Signal(PlaylistData, bytes)
-
-    def __init__(self):
+    on_reset_playlists = QtCore.Signal()
+    on_add_playlists = QtCore.Signal(list)
+    on_update_playlists = QtCore.Signal(list)
+    on_remove_playlists = QtCore.Signal(list)
+    found_cover = QtCore.Signal(str, bytes)
+
+    def __init__(
+        self,
+        snapshot_rows: list[PlaylistData] | None = None,
+        atlas_ids: set[str] | None = None,
+    ):
         super().__init__()
+        self.snapshot_rows = snapshot_rows
+        # Playlists whose thumbnail already came with the startup atlas
+        self.atlas_ids = atlas_ids or set()
 
     @QtCore.Slot()
     def cancel(self):
@@ -231,30 +306,84 @@ class ParsePlaylistsWorker(QtCore.QObject):
 
     def run(self):
         try:
-            current_playlists = CONFIG.get_all_playlists()
-
-            if current_playlists is None:
-                print("Unable to show saved playlists: Non existent key on json file")
-                return
-
-            for i, playlist in enumerate(current_playlists.values()):
+            current_playlists = CONFIG.get_ordered_playlists()
+            total = len(current_playlists)
+
+            # Cached covers are read from the pack when their row gets painted
+            missing_covers = [
+                playlist
+                for playlist in current_playlists
+                if not CACHE.has_cover(playlist.get("id"))
+            ]
+
+            if self.snapshot_rows is None:
+                self._add_playlists(current_playlists, total)
+            else:
+                self._reconcile_snapshot(current_playlists, total)
+
+            # The first screen is read in one pass, not a pack read per painted row
+            prefetch_ids = [
+                playlist.get("id")
+                for playlist in current_playlists[:PREFETCH_COVER_ROWS]
+                if playlist.get("id") not in self.atlas_ids
+            ]
+            for p_id, cover_bytes in CACHE.get_covers(prefetch_ids).items():
+                self.found_cover.emit(p_id, cover_bytes)
+
+            # Only covers never cached are downloaded, once every row is shown
+            for i, playlist in enumerate(missing_covers):
                 p_id = playlist.get("id")
-                cover_bytes = CACHE.get_cover(p_id)
-
-                if not cover_bytes:
-                    response = requests.get(playlist.get("cover_url"))
-
-                    if response.status_code == 200:
-                        cover_bytes = response.content or bytes()
-                        CACHE.save_cover(cover_bytes, p_id)
-                    else:
-                        cover_bytes = bytes()
-
-                self.on_add_playlist.emit(playlist, cover_bytes)
                 self.progress.emit(
-                    [f"Loading playlist... {i + 1}/{len(current_playlists)}"]
+                    [f"Downloading cover... {i + 1}/{len(missing_covers)}"]
                 )
+
+                cover_bytes = fetch_bytes(playlist.get("cover_url"))
+                CACHE.save_cover(cover_bytes, p_id)
+                self.found_cover.emit(p_id, cover_bytes)
+
+            CACHE.flush()
         except Exception as e:
             print(f"An unexpected error occurred during playlist processing: {e}")
         finally:
             self.finished.emit()
+
+    def _add_playlists(self, playlists: list[PlaylistData], total: int):
+        loaded = total - len(playlists)
+        for start in range(0, len(playlists), LOAD_BATCH_SIZE):
+            batch = playlists[start : start + LOAD_BATCH_SIZE]
+            self.on_add_playlists.emit([(playlist, bytes()) for playlist in batch])
+            self.progress.emit(
+                [f"Loading playlist... {loaded + start + len(batch)}/{total}"]
+            )
+
+    def _reconcile_snapshot(self, current_playlists: list[PlaylistData], total: int):
+        """Patch the rows painted from the startup snapshot to match the config"""
+        snapshot_by_id = {row.get("id"): row for row in self.snapshot_rows}
+        current_ids = [playlist.get("id") for playlist in current_playlists]
+        current_id_set = set(current_ids)
+        kept_ids = [p_id for p_id in snapshot_by_id if p_id in current_id_set]
+
+        # Playlists reordered since the snapshot can't be patched row by row
+        if current_ids[: len(kept_ids)] != kept_ids:
+            self.on_reset_playlists.emit()
+            self._add_playlists(current_playlists, total)
+            return
+
+        removed_ids = [p_id for p_id in snapshot_by_id if p_id not in current_id_set]
+        if removed_ids:
+            self.on_remove_playlists.emit(removed_ids)
+
+        # Headless syncs rewrite fields like snapshot_id, only shown ones matter
+        changed_playlists = [
+            playlist
+            for playlist in current_playlists[: len(kept_ids)]
+            if any(
+                playlist.get(field) != snapshot_by_id[playlist.get("id")].get(field)
+                for field in DISPLAYED_FIELDS
+            )
+        ]
+        if changed_playlists:
+            self.on_update_playlists.emit(changed_playlists)
+
+        # New playlists always go after the rest
+        self._add_playlists(current_playlists[len(kept_ids) :], total)
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Union
 from PySide6 import QtCore
 from PySide6.QtGui import QColor, QPalette
 from PySide6.QtWidgets import (
@@ -9,7 +9,6 @@ from PySide6.QtWidgets import (
     QWidget,
     QLabel,
 )
-from spotdl import Union
 
 LOADER_TYPE = Union[Literal["LOCAL"], Literal["OVERLAY"]]
 
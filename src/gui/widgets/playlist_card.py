@@ -1,199 +1,245 @@
 import threading
-from typing import Callable, Literal
-from PySide6 import QtCore, QtWidgets
-from PySide6.QtGui import QPixmap
-from src.logic.spotdl_commands import syncPlaylist
-from src.utils.cache_manager import CACHE
-from src.utils.config_manager import CONFIG, PlaylistData
-from src.utils.card_shared_worker import CARD_SHARED_WORKER
-from src.utils.utils import cleanup_thread
+from typing import Literal
+from PySide6 import QtCore, QtGui, QtWidgets
+from src.gui.widgets.playlist_list_model import COVER_BYTES_ROLE, PLAYLIST_ROLE
+from src.logic.sync_scheduler import sync_playlist
+from src.utils.cache_manager import THUMBNAIL_SIZE
+from src.utils.config_manager import PlaylistData
+from src.utils.song_cache import SONG_CACHE
 
 CARD_MARGIN = 10
+CARD_PADDING = 9
+BUTTON_SPACING = 6
 MAX_HEIGHT = 130
-COVER_DIMS = 90
+COVER_DIMS = THUMBNAIL_SIZE
 
 CardType = Literal["search", "manage"]
 
+# (action, text, stretch) of the controls on the bottom row of a card
+SEARCH_BUTTONS = (("add", "Add", 1),)
+MANAGE_BUTTONS = (
+    ("enabled", "Enabled: ", 8),
+    ("up", "↑", 1),
+    ("down", "↓", 1),
+    ("sync", "Sync", 2),
+    ("remove", "Remove", 2),
+)
 
-# BUG: INDIVIDUAL SYNC CANCEL NOT WORKING
-class PlaylistCard(QtWidgets.QWidget):
-    on_add_playlist = QtCore.Signal(PlaylistData, bytes)
-    on_sync_start = QtCore.Signal()
-    on_sync_progress_update = QtCore.Signal(list)
-    on_sync_finish = QtCore.Signal()
-    on_delete = QtCore.Signal()
-
-    def __init__(
-        self,
-        type: CardType,
-        new_playlist: PlaylistData,
-        cover_bytes: bytes,
-        on_priority_change: Callable,
-    ):
-        super().__init__()
-
-        self.setMaximumHeight(MAX_HEIGHT)
-
-        self._logic_thread = None
-
-        self.playlist = new_playlist
-
-        title = new_playlist.get("title", "N/A")
-        total_tracks = new_playlist.get("total_tracks", "-1")
-        url = self.playlist.get("url", "#")
-        p_id = new_playlist.get("id")
-
-        top_layout = QtWidgets.QVBoxLayout(self)
-        top_layout.setContentsMargins(
-            CARD_MARGIN, CARD_MARGIN, CARD_MARGIN, CARD_MARGIN
-        )
 
-        playlist_card = QtWidgets.QFrame()
-        playlist_card.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+class PlaylistCardDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Paints a playlist card for each visible row of a PlaylistListModel.
 
-        top_layout.addWidget(playlist_card)
+    Cards are not widgets, clicks on their buttons are hit-tested here and
+    forwarded as signals carrying the row or the playlist.
+    """
 
-        horizonal_layout = QtWidgets.QHBoxLayout(playlist_card)
-
-        # Cover Image Label
-        image_label = QtWidgets.QLabel()
-        image_label.setScaledContents(True)
-        image_label.setFixedSize(COVER_DIMS, COVER_DIMS)
-        image_label.setScaledContents(True)
-
-        cover_img = QPixmap()
-        cover_img.loadFromData(cover_bytes)
-        image_label.setPixmap(cover_img)
+    on_add_playlist = QtCore.Signal(PlaylistData, bytes)
+    on_toggle_playlist = QtCore.Signal(int, bool)
+    on_priority_change = QtCore.Signal(int, int)
+    on_sync_playlist = QtCore.Signal(PlaylistData)
+    on_remove_playlist = QtCore.Signal(str)
+
+    def __init__(self, type: CardType, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.buttons = SEARCH_BUTTONS if type == "search" else MANAGE_BUTTONS
+        # (row, action) of the button held down, drawn sunken until released
+        self._pressed: tuple[int, str] | None = None
+
+    def sizeHint(
+        self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex
+    ) -> QtCore.QSize:
+        return QtCore.QSize(option.rect.width(), MAX_HEIGHT)
+
+    # --- GEOMETRY ---
+
+    def _card_rect(self, rect: QtCore.QRect) -> QtCore.QRect:
+        return rect.adjusted(CARD_MARGIN, CARD_MARGIN, -CARD_MARGIN, -CARD_MARGIN)
+
+    def _cover_rect(self, card: QtCore.QRect) -> QtCore.QRect:
+        top = card.top() + (card.height() - COVER_DIMS) // 2
+        return QtCore.QRect(card.left() + CARD_PADDING, top, COVER_DIMS, COVER_DIMS)
+
+    def _line_rects(self, card: QtCore.QRect) -> list[QtCore.QRect]:
+        """Three text lines followed by the buttons row, right of the cover"""
+        left = self._cover_rect(card).right() + 1 + CARD_PADDING
+        width = card.right() - CARD_PADDING - left
+        height = (card.height() - 2 * CARD_PADDING) // 4
+        top = card.top() + CARD_PADDING
+        return [QtCore.QRect(left, top + i * height, width, height) for i in range(4)]
+
+    def _button_rects(self, rect: QtCore.QRect) -> list[tuple[str, str, QtCore.QRect]]:
+        row_rect = self._line_rects(self._card_rect(rect))[3]
+        total_stretch = sum(stretch for _, _, stretch in self.buttons)
+        free_width = row_rect.width() - BUTTON_SPACING * (len(self.buttons) - 1)
+
+        buttons = []
+        left = row_rect.left()
+        for action, text, stretch in self.buttons:
+            width = free_width * stretch // total_stretch
+            button_rect = QtCore.QRect(left, row_rect.top(), width, row_rect.height())
+            buttons.append((action, text, button_rect))
+            left += width + BUTTON_SPACING
+        return buttons
+
+    def _button_at(self, rect: QtCore.QRect, pos: QtCore.QPoint) -> str | None:
+        for action, _, button_rect in self._button_rects(rect):
+            if button_rect.contains(pos):
+                return action
+        return None
+
+    # --- PAINTING ---
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ):
+        playlist: PlaylistData | None = index.data(PLAYLIST_ROLE)
+        if playlist is None:
+            return
 
-        horizonal_layout.addWidget(image_label)
+        widget = option.widget
+        style = widget.style() if widget else QtWidgets.QApplication.style()
+        card = self._card_rect(option.rect)
 
-        # Playlist Info Layout
-        playlist_layout = QtWidgets.QVBoxLayout()
+        painter.save()
 
-        # Title Label
-        title_label = QtWidgets.QLabel(f"Title: <b>{title}</b>")
-        title_label.setTextInteractionFlags(
-            QtCore.Qt.TextInteractionFlag.TextSelectableByMouse
+        frame = QtWidgets.QStyleOptionFrame()
+        frame.rect = card
+        frame.palette = option.palette
+        frame.state = QtWidgets.QStyle.StateFlag.State_Enabled
+        frame.lineWidth = 1
+        frame.frameShape = QtWidgets.QFrame.Shape.StyledPanel
+        style.drawControl(
+            QtWidgets.QStyle.ControlElement.CE_ShapedFrame, frame, painter, widget
         )
-        playlist_layout.addWidget(title_label)
 
-        # Total Tracks Label
-        total_tracks_label = QtWidgets.QLabel(f"Total Tracks: <b>{total_tracks}</b>")
-        total_tracks_label.setTextInteractionFlags(
-            QtCore.Qt.TextInteractionFlag.TextSelectableByMouse
-        )
-        playlist_layout.addWidget(total_tracks_label)
+        pixmap = index.data(QtCore.Qt.ItemDataRole.DecorationRole)
+        if pixmap is not None and not pixmap.isNull():
+            painter.drawPixmap(self._cover_rect(card), pixmap)
 
-        # Url Label
-        url_label = QtWidgets.QLabel(f"URL: <b>{url}</b>")
-        url_label.setTextInteractionFlags(
-            QtCore.Qt.TextInteractionFlag.TextSelectableByMouse
+        fields = (
+            ("Title: ", str(playlist.get("title", "N/A"))),
+            ("Total Tracks: ", str(playlist.get("total_tracks", "-1"))),
+            ("URL: ", str(playlist.get("url", "#"))),
         )
-        playlist_layout.addWidget(url_label)
-
-        horizonal_layout.addLayout(playlist_layout)
-
-        if type == "search":
-            # Add playlist button
-            add_btn = QtWidgets.QPushButton("Add")
-            add_btn.clicked.connect(
-                lambda _, p=self.playlist, b=cover_bytes: self.on_add_playlist.emit(
-                    p, b
+        painter.setPen(option.palette.color(QtGui.QPalette.ColorRole.Text))
+        for line_rect, (label, value) in zip(self._line_rects(card), fields):
+            self._draw_field(painter, option.font, line_rect, label, value)
+
+        for action, text, button_rect in self._button_rects(option.rect):
+            button = QtWidgets.QStyleOptionButton()
+            button.rect = button_rect
+            button.text = text
+            button.palette = option.palette
+            button.state = QtWidgets.QStyle.StateFlag.State_Enabled
+
+            if action == "enabled":
+                button.state |= (
+                    QtWidgets.QStyle.StateFlag.State_On
+                    if playlist.get("enabled")
+                    else QtWidgets.QStyle.StateFlag.State_Off
                 )
-            )
-            playlist_layout.addWidget(add_btn)
-        else:
-            buttons_layout = QtWidgets.QHBoxLayout()
+                element = QtWidgets.QStyle.ControlElement.CE_CheckBox
+            else:
+                if self._pressed == (index.row(), action):
+                    button.state |= QtWidgets.QStyle.StateFlag.State_Sunken
+                else:
+                    button.state |= QtWidgets.QStyle.StateFlag.State_Raised
+                element = QtWidgets.QStyle.ControlElement.CE_PushButton
 
-            self.enabled_checkbox = QtWidgets.QCheckBox("Enabled: ")
-            self.enabled_checkbox.setChecked(new_playlist.get("enabled"))
-            self.enabled_checkbox.toggled.connect(self.toggle_playlist)
-            buttons_layout.addWidget(self.enabled_checkbox, stretch=8)
+            style.drawControl(element, button, painter, widget)
 
-            priority_up_btn = QtWidgets.QPushButton("↑")
-            priority_up_btn.clicked.connect(lambda: on_priority_change(self, -1))
-            buttons_layout.addWidget(priority_up_btn, stretch=1)
+        painter.restore()
 
-            priority_down_btn = QtWidgets.QPushButton("↓")
-            priority_down_btn.clicked.connect(lambda: on_priority_change(self, 1))
-            buttons_layout.addWidget(priority_down_btn, stretch=1)
-
-            sync_btn = QtWidgets.QPushButton("Sync")
-            sync_btn.clicked.connect(lambda _, p=new_playlist: self._sync_playlist(p))
-            buttons_layout.addWidget(sync_btn, stretch=2)
-
-            remove_btn = QtWidgets.QPushButton("Remove")
-            remove_btn.clicked.connect(lambda _, p_id=p_id: self._remove_playlist(p_id))
-            buttons_layout.addWidget(remove_btn, stretch=2)
-
-            playlist_layout.addLayout(buttons_layout)
-
-    @QtCore.Slot(bool, str)
-    def toggle_playlist(self, enabled: bool):
-        self.enabled_checkbox.setChecked(enabled)
-
-        p_id = self.playlist.get("id")
-
-        playlist = CONFIG.get_playlist(p_id)
-
-        if playlist is None:
-            print(f"Unable to toggle playlist with id {p_id}: Not found on list")
-            return
-
-        playlist["enabled"] = enabled
+    def _draw_field(
+        self,
+        painter: QtGui.QPainter,
+        font: QtGui.QFont,
+        rect: QtCore.QRect,
+        label: str,
+        value: str,
+    ):
+        flags = QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter
 
-        playlist = CONFIG.set_playlist(playlist)
+        painter.setFont(font)
+        painter.drawText(rect, flags, label)
 
-    @QtCore.Slot(PlaylistData)
-    def _sync_playlist(self, playlist: PlaylistData):
-        if self._logic_thread and self._logic_thread.isRunning():
-            print("Previous sync is still running, cancelling...")
-            return
+        bold_font = QtGui.QFont(font)
+        bold_font.setBold(True)
+        value_rect = rect.adjusted(
+            QtGui.QFontMetrics(font).horizontalAdvance(label), 0, 0, 0
+        )
+        value = QtGui.QFontMetrics(bold_font).elidedText(
+            value, QtCore.Qt.TextElideMode.ElideRight, value_rect.width()
+        )
 
-        self._logic_thread = QtCore.QThread()
-        CARD_SHARED_WORKER.shared_worker = SyncPlaylistsWorker(playlist)
+        painter.setFont(bold_font)
+        painter.drawText(value_rect, flags, value)
 
-        CARD_SHARED_WORKER.shared_worker.moveToThread(self._logic_thread)
+    # --- INPUT ---
 
-        self._logic_thread.started.connect(CARD_SHARED_WORKER.shared_worker.run)
-        self._logic_thread.finished.connect(
-            lambda: cleanup_thread(self, "shared_worker", "_logic_thread")
+    def editorEvent(
+        self,
+        event: QtCore.QEvent,
+        model: QtCore.QAbstractItemModel,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> bool:
+        mouse_events = (
+            QtCore.QEvent.Type.MouseButtonPress,
+            QtCore.QEvent.Type.MouseButtonRelease,
+            QtCore.QEvent.Type.MouseButtonDblClick,
         )
+        if event.type() not in mouse_events:
+            return super().editorEvent(event, model, option, index)
 
-        CARD_SHARED_WORKER.shared_worker.finished.connect(self._logic_thread.quit)
+        if event.button() != QtCore.Qt.MouseButton.LeftButton:
+            return False
 
-        # Custom Signals
-        CARD_SHARED_WORKER.shared_worker.progress.connect(
-            self.on_sync_progress_update.emit
-        )
-        CARD_SHARED_WORKER.shared_worker.finished.connect(self.on_sync_finish.emit)
+        action = self._button_at(option.rect, event.position().toPoint())
 
-        self.synching_playlist_count = sum(
-            playlist.get("enabled", False)
-            for playlist in CONFIG.get_all_playlists().values()
-        )
+        if event.type() == QtCore.QEvent.Type.MouseButtonPress:
+            self._pressed = (index.row(), action) if action else None
+            self._repaint(option)
+            return action is not None
 
-        self.on_sync_start.emit()
-        self._logic_thread.start()
+        if event.type() == QtCore.QEvent.Type.MouseButtonDblClick:
+            return action is not None
 
-    @QtCore.Slot(str)
-    def _remove_playlist(self, p_id: str):
-        current_playlists = CONFIG.get_all_playlists()
+        pressed, self._pressed = self._pressed, None
+        self._repaint(option)
 
-        if current_playlists is None or p_id not in current_playlists:
-            print(
-                "Unable to remove playlist: List is empty or playlist is not present in it"
-            )
-            return
+        # Like a real button, the click only counts if released over it
+        if action is None or pressed != (index.row(), action):
+            return False
 
-        del current_playlists[p_id]
+        self._trigger(action, index)
+        return True
 
-        CONFIG.set_all_playlists(current_playlists)
-        CACHE.delete_cache_of_playlist(p_id)
+    def _repaint(self, option: QtWidgets.QStyleOptionViewItem):
+        view = option.widget
+        if isinstance(view, QtWidgets.QAbstractItemView):
+            view.viewport().update(option.rect)
 
-        self.on_delete.emit()
+    def _trigger(self, action: str, index: QtCore.QModelIndex):
+        playlist: PlaylistData = index.data(PLAYLIST_ROLE)
+        row = index.row()
 
-        self.deleteLater()
+        if action == "add":
+            self.on_add_playlist.emit(playlist, index.data(COVER_BYTES_ROLE))
+        elif action == "enabled":
+            self.on_toggle_playlist.emit(row, not playlist.get("enabled"))
+        elif action == "up":
+            self.on_priority_change.emit(row, -1)
+        elif action == "down":
+            self.on_priority_change.emit(row, 1)
+        elif action == "sync":
+            self.on_sync_playlist.emit(playlist)
+        elif action == "remove":
+            self.on_remove_playlist.emit(playlist.get("id"))
 
 
 class SyncPlaylistsWorker(QtCore.QObject):
@@ -212,10 +258,11 @@ class SyncPlaylistsWorker(QtCore.QObject):
 
     def run(self):
         try:
-            syncPlaylist(self.playlist, 1, 1, self.progress, self.cancel_event)
+            sync_playlist(self.playlist, 1, 1, self.progress.emit, self.cancel_event)
         except Exception as e:
             print(
                 f"An error occurred while synchronizing the playlist '{self.playlist.get('title')}': {e}"
             )
         finally:
+            SONG_CACHE.save()
             self.finished.emit()
@@ -0,0 +1,196 @@
+from PySide6 import QtCore, QtGui
+from src.utils.cache_manager import THUMBNAIL_SIZE
+from src.utils.config_manager import PlaylistData
+from src.utils.thumbnail_cache import COVER_DECODER, THUMBNAILS
+
+PLAYLIST_ROLE = QtCore.Qt.ItemDataRole.UserRole + 1
+COVER_BYTES_ROLE = QtCore.Qt.ItemDataRole.UserRole + 2
+
+# Playlist fields a row shows, changes to any other field don't need a repaint
+DISPLAYED_FIELDS = ("title", "total_tracks", "url", "enabled")
+
+
+class PlaylistListModel(QtCore.QAbstractListModel):
+    """Playlists shown by a list view, one row per playlist in display order"""
+
+    def __init__(self, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self._playlists: list[PlaylistData] = []
+        self._covers: dict[str, bytes] = {}
+        # id -> row, rebuilt lazily after rows are moved or removed
+        self._rows: dict[str, int] | None = {}
+        self._placeholder: QtGui.QPixmap | None = None
+
+        COVER_DECODER.ready.connect(self._on_cover_ready)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._playlists)
+
+    def data(self, index: QtCore.QModelIndex, role: int = 0):
+        if not index.isValid() or not 0 <= index.row() < len(self._playlists):
+            return None
+
+        playlist = self._playlists[index.row()]
+        p_id = playlist.get("id")
+
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return playlist.get("title", "N/A")
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            return playlist.get("url", "#")
+        if role == QtCore.Qt.ItemDataRole.DecorationRole:
+            pixmap = THUMBNAILS.peek(p_id)
+            if pixmap is not None:
+                return pixmap
+
+            # Only rows being painted get their cover decoded, off this thread
+            COVER_DECODER.request(p_id, self._covers.get(p_id), THUMBNAIL_SIZE)
+            return self._get_placeholder()
+        if role == PLAYLIST_ROLE:
+            return playlist
+        if role == COVER_BYTES_ROLE:
+            return self._covers.get(p_id, bytes())
+        return None
+
+    def _get_placeholder(self) -> QtGui.QPixmap:
+        if self._placeholder is None:
+            self._placeholder = QtGui.QPixmap(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+            self._placeholder.fill(
+                QtGui.QGuiApplication.palette().color(QtGui.QPalette.ColorRole.Mid)
+            )
+        return self._placeholder
+
+    @QtCore.Slot(str)
+    def _on_cover_ready(self, p_id: str):
+        row = self.row_of(p_id)
+        if row >= 0:
+            index = self.index(row)
+            self.dataChanged.emit(
+                index, index, [QtCore.Qt.ItemDataRole.DecorationRole]
+            )
+
+    # --- ROWS ---
+
+    def playlist_at(self, row: int) -> PlaylistData | None:
+        if 0 <= row < len(self._playlists):
+            return self._playlists[row]
+        return None
+
+    def row_of(self, p_id: str) -> int:
+        if self._rows is None:
+            self._rows = {
+                playlist.get("id"): row for row, playlist in enumerate(self._playlists)
+            }
+        return self._rows.get(p_id, -1)
+
+    def playlists(self) -> list[PlaylistData]:
+        return list(self._playlists)
+
+    def append_playlists(self, playlists: list[tuple[PlaylistData, bytes]]) -> int:
+        """Append (playlist, cover bytes) pairs at once, returns the first new row"""
+        first_row = len(self._playlists)
+        if not playlists:
+            return first_row
+
+        self.beginInsertRows(
+            QtCore.QModelIndex(), first_row, first_row + len(playlists) - 1
+        )
+        for playlist, cover_bytes in playlists:
+            p_id = playlist.get("id")
+            if self._rows is not None:
+                self._rows[p_id] = len(self._playlists)
+            self._playlists.append(playlist)
+            if cover_bytes:
+                self._covers[p_id] = cover_bytes
+        self.endInsertRows()
+
+        return first_row
+
+    def remove_playlist(self, p_id: str) -> bool:
+        row = self.row_of(p_id)
+        if row < 0:
+            return False
+
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self._playlists[row]
+        self._covers.pop(p_id, None)
+        self._rows = None
+        self.endRemoveRows()
+
+        return True
+
+    def move_playlist(self, row: int, new_row: int) -> bool:
+        count = len(self._playlists)
+        if row == new_row or not (0 <= row < count and 0 <= new_row < count):
+            return False
+
+        # Qt expects the destination as the row the moved one ends up before
+        destination = new_row + 1 if new_row > row else new_row
+        parent = QtCore.QModelIndex()
+        if not self.beginMoveRows(parent, row, row, parent, destination):
+            return False
+
+        self._playlists.insert(new_row, self._playlists.pop(row))
+        self._rows = None
+        self.endMoveRows()
+
+        return True
+
+    def clear(self):
+        self.beginResetModel()
+        self._playlists.clear()
+        self._covers.clear()
+        self._rows = {}
+        self.endResetModel()
+
+    # --- ROW DATA ---
+
+    def set_cover(self, p_id: str, cover_bytes: bytes):
+        if not cover_bytes:
+            return
+
+        # Kept for rows still waiting to be inserted, they decode it when painted
+        self._covers[p_id] = cover_bytes
+        if self.row_of(p_id) < 0:
+            return
+
+        # The row repaints once the new cover is decoded
+        COVER_DECODER.request(p_id, cover_bytes, THUMBNAIL_SIZE, force=True)
+
+    def update_playlist(self, playlist: PlaylistData) -> bool:
+        row = self.row_of(playlist.get("id"))
+        if row < 0:
+            return False
+
+        self._playlists[row] = playlist
+        index = self.index(row)
+        self.dataChanged.emit(
+            index,
+            index,
+            [
+                QtCore.Qt.ItemDataRole.DisplayRole,
+                QtCore.Qt.ItemDataRole.ToolTipRole,
+                PLAYLIST_ROLE,
+            ],
+        )
+
+        return True
+
+    def set_enabled(self, row: int, enabled: bool):
+        playlist = self.playlist_at(row)
+        if playlist is None:
+            return
+
+        playlist["enabled"] = enabled
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [PLAYLIST_ROLE])
+
+    def set_all_enabled(self, enabled: bool):
+        if not self._playlists:
+            return
+
+        for playlist in self._playlists:
+            playlist["enabled"] = enabled
+
+        self.dataChanged.emit(
+            self.index(0), self.index(len(self._playlists) - 1), [PLAYLIST_ROLE]
+        )
@@ -1,13 +1,32 @@
-from PySide6 import QtWidgets
-from src.gui.widgets.playlist_card import PlaylistCard
-from src.utils.config_manager import CONFIG
+from PySide6 import QtCore, QtGui, QtWidgets
+from src.gui.widgets.playlist_card import CardType, PlaylistCardDelegate
+from src.gui.widgets.playlist_list_model import PlaylistListModel
+from src.utils.cache_manager import CACHE
+from src.utils.config_manager import CONFIG, PlaylistData
+from src.utils.thumbnail_cache import THUMBNAILS
+from src.utils.title_index import TitleIndex
+from src.utils.track_manifest import delete_manifest
+
+# Typing pauses shorter than this don't trigger a new filter pass
+FILTER_DELAY_MS = 150
 
 
 class ScrollPlaylistsContainer(QtWidgets.QWidget):
-    def __init__(self):
+    on_add_playlist = QtCore.Signal(PlaylistData, bytes)
+    on_sync_playlist = QtCore.Signal(PlaylistData)
+
+    def __init__(self, type: CardType):
         super().__init__()
 
-        self.playlist_cards: list[PlaylistCard] = []
+        self.title_index = TitleIndex()
+        self._hidden_ids: set[str] = set()
+
+        self._filter_timer = QtCore.QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(
+            lambda: self.filter_by_title(self.playlist_le.text())
+        )
 
         self.main_layout = QtWidgets.QVBoxLayout(self)
 
@@ -15,9 +34,7 @@ class ScrollPlaylistsContainer(QtWidgets.QWidget):
         seach_layout = QtWidgets.QHBoxLayout()
 
         self.playlist_le = QtWidgets.QLineEdit()
-        self.playlist_le.textChanged.connect(
-            lambda: self.filter_by_title(self.playlist_le.text())
-        )
+        self.playlist_le.textChanged.connect(self._filter_timer.start)
         self.playlist_le.setPlaceholderText("Filter by playlist name")
         seach_layout.addWidget(self.playlist_le)
 
@@ -28,74 +45,170 @@ class ScrollPlaylistsContainer(QtWidgets.QWidget):
         seach_layout.addWidget(search_song_btn)
         self.main_layout.addLayout(seach_layout)
 
-        # Scroll container
-        self.playlists_container_widget = None
-        self.playlists_container_layout = None
-        self.vertical_spacer = None
+        # Playlists list, only the visible rows are painted
+        self.playlists_model = PlaylistListModel(self)
 
-        self.scroll_area = QtWidgets.QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-
-        self.main_layout.addWidget(self.scroll_area)
+        self.playlists_delegate = PlaylistCardDelegate(type, self)
+        self.playlists_delegate.on_add_playlist.connect(self.on_add_playlist.emit)
+        self.playlists_delegate.on_sync_playlist.connect(self.on_sync_playlist.emit)
+        self.playlists_delegate.on_toggle_playlist.connect(self.toggle_playlist)
+        self.playlists_delegate.on_priority_change.connect(
+            self.change_playlist_priority
+        )
+        self.playlists_delegate.on_remove_playlist.connect(self.remove_playlist)
+
+        self.playlists_view = QtWidgets.QListView()
+        self.playlists_view.setModel(self.playlists_model)
+        self.playlists_view.setItemDelegate(self.playlists_delegate)
+        self.playlists_view.setUniformItemSizes(True)
+        self.playlists_view.setSelectionMode(
+            QtWidgets.QAbstractItemView.SelectionMode.NoSelection
+        )
+        self.playlists_view.setEditTriggers(
+            QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers
+        )
+        self.playlists_view.setVerticalScrollMode(
+            QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel
+        )
+        self.playlists_view.setContextMenuPolicy(
+            QtCore.Qt.ContextMenuPolicy.CustomContextMenu
+        )
+        self.playlists_view.customContextMenuRequested.connect(self._show_context_menu)
 
-        # Scroll card container
-        self.reset_playlist_layout()
+        self.main_layout.addWidget(self.playlists_view)
 
     def reset_playlist_layout(self):
-        if self.playlists_container_widget:
-            self.playlists_container_widget.deleteLater()
-            self.playlists_container_widget = None
+        self.playlists_model.clear()
+        self.title_index.clear()
+        self._hidden_ids.clear()
 
-        self.playlists_container_widget = QtWidgets.QWidget()
+    def add_playlist(self, playlist: PlaylistData, cover_bytes: bytes) -> int:
+        return self.add_playlists([(playlist, cover_bytes)])
 
-        self.playlists_container_layout = QtWidgets.QVBoxLayout(
-            self.playlists_container_widget
-        )
-        self.playlists_container_layout.setContentsMargins(0, 0, 0, 0)
-        self.playlists_container_layout.setSpacing(0)
-
-        self.vertical_spacer = QtWidgets.QSpacerItem(
-            0,
-            0,
-            QtWidgets.QSizePolicy.Policy.Minimum,
-            QtWidgets.QSizePolicy.Policy.Expanding,
+    def add_playlists(self, playlists: list[tuple[PlaylistData, bytes]]) -> int:
+        """Append (playlist, cover bytes) pairs, returns the row of the first one"""
+        first_row = self.playlists_model.append_playlists(playlists)
+        title_filter = self.playlist_le.text()
+
+        for row, (playlist, _) in enumerate(playlists, start=first_row):
+            p_id = playlist.get("id")
+            self.title_index.add(p_id, playlist.get("title", ""))
+
+            if title_filter and not self.title_index.matches(p_id, title_filter):
+                self.playlists_view.setRowHidden(row, True)
+                self._hidden_ids.add(p_id)
+
+        return first_row
+
+    def update_playlist(self, playlist: PlaylistData):
+        """Replace the shown data of a playlist already on the list"""
+        p_id = playlist.get("id")
+        row = self.playlists_model.row_of(p_id)
+        if row < 0 or not self.playlists_model.update_playlist(playlist):
+            return
+
+        self.title_index.add(p_id, playlist.get("title", ""))
+
+        title_filter = self.playlist_le.text()
+        hidden = bool(title_filter) and not self.title_index.matches(
+            p_id, title_filter
         )
-        self.playlists_container_layout.addItem(self.vertical_spacer)
+        self.playlists_view.setRowHidden(row, hidden)
+        if hidden:
+            self._hidden_ids.add(p_id)
+        else:
+            self._hidden_ids.discard(p_id)
+
+    def remove_playlist_row(self, p_id: str):
+        """Take a playlist off the list, without touching its saved data"""
+        self.playlists_model.remove_playlist(p_id)
+        self.title_index.remove(p_id)
+        self._hidden_ids.discard(p_id)
+
+    def set_playlist_cover(self, p_id: str, cover_bytes: bytes):
+        self.playlists_model.set_cover(p_id, cover_bytes)
+
+    @QtCore.Slot(int, int)
+    def change_playlist_priority(self, row: int, direction: int):
+        playlist = self.playlists_model.playlist_at(row)
+        new_row = row + direction
+
+        if playlist is None:
+            print("Error changing playlist priority: row is out of the list")
+            return
 
-        self.scroll_area.setWidget(self.playlists_container_widget)
+        if self.playlists_model.move_playlist(row, new_row):
+            CONFIG.set_playlist_priority(playlist.get("id"), new_row)
 
-        self.playlist_cards.clear()
+    @QtCore.Slot(int, bool)
+    def toggle_playlist(self, row: int, enabled: bool):
+        playlist = self.playlists_model.playlist_at(row)
+        p_id = playlist.get("id") if playlist else None
 
-    def add_playlist_card(self, playlist_card: PlaylistCard):
-        if not self.playlists_container_layout:
+        if p_id is None or CONFIG.get_playlist(p_id) is None:
+            print(f"Unable to toggle playlist with id {p_id}: Not found on list")
             return
 
-        insertion_index = self.playlists_container_layout.count() - 1
+        CONFIG.set_playlist_enabled(p_id, enabled)
+        self.playlists_model.set_enabled(row, enabled)
 
-        # Always add on top
-        self.playlists_container_layout.insertWidget(insertion_index, playlist_card)
-        self.playlist_cards.append(playlist_card)
+    def set_all_enabled(self, enabled: bool):
+        with CONFIG.batch():
+            for playlist in self.playlists_model.playlists():
+                CONFIG.set_playlist_enabled(playlist.get("id"), enabled)
 
-        return insertion_index
+        self.playlists_model.set_all_enabled(enabled)
 
-    def change_playlist_priority(self, card: PlaylistCard, direction: int):
-        old_index = card.playlist.get("priority")
-        new_index = old_index + direction
+    @QtCore.Slot(str)
+    def remove_playlist(self, p_id: str):
+        if not CONFIG.remove_playlist(p_id):
+            print(
+                "Unable to remove playlist: List is empty or playlist is not present in it"
+            )
+            return
 
-        if 0 <= new_index < len(self.playlist_cards):
-            if not self.playlists_container_layout:
-                print(
-                    "Error changing playlist priority: playlists_container_layout is None"
-                )
-                return
+        CACHE.delete_cache_of_playlist(p_id)
+        THUMBNAILS.discard(p_id)
+        delete_manifest(p_id)
 
-            CONFIG.set_playlist_priority(card.playlist.get("id"), new_index)
-            self.playlists_container_layout.insertWidget(new_index, card)
+        self.remove_playlist_row(p_id)
 
     def filter_by_title(self, title_filter: str):
-        for card in self.playlist_cards:
-            title = card.playlist.get("title")
-            if not title_filter or title_filter.lower() in title.lower():
-                card.show()
-            else:
-                card.hide()
+        self._filter_timer.stop()
+
+        scores = self.title_index.search(title_filter)
+        hidden_ids = {
+            playlist.get("id")
+            for playlist in self.playlists_model.playlists()
+            if playlist.get("id") not in scores
+        }
+
+        # Only rows whose visibility changed are touched
+        for p_id in hidden_ids.symmetric_difference(self._hidden_ids):
+            row = self.playlists_model.row_of(p_id)
+            if row >= 0:
+                self.playlists_view.setRowHidden(row, p_id in hidden_ids)
+        self._hidden_ids = hidden_ids
+
+        # Rows keep their priority order, the best match is brought into view
+        if title_filter and scores:
+            best_row = self.playlists_model.row_of(next(iter(scores)))
+            self.playlists_view.scrollTo(
+                self.playlists_model.index(best_row),
+                QtWidgets.QAbstractItemView.ScrollHint.PositionAtTop,
+            )
+
+    @QtCore.Slot(QtCore.QPoint)
+    def _show_context_menu(self, pos: QtCore.QPoint):
+        playlist = self.playlists_model.playlist_at(
+            self.playlists_view.indexAt(pos).row()
+        )
+        if playlist is None:
+            return
+
+        # Card text is painted, so the URL can't be selected and copied anymore
+        menu = QtWidgets.QMenu(self)
+        copy_url_action = menu.addAction("Copy URL")
+        global_pos = self.playlists_view.viewport().mapToGlobal(pos)
+        if menu.exec(global_pos) == copy_url_action:
+            QtGui.QGuiApplication.clipboard().setText(playlist.get("url", ""))
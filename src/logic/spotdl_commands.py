@@ -1,32 +1,63 @@
 import os
 import re
-from threading import Event
-from PySide6.QtCore import SignalInstance
-import requests
-from spotdl import Spotdl
-import spotdl.utils.config as spotDlConfig
-import spotipy
-from spotipy.client import SpotifyException
-from spotipy.oauth2 import SpotifyClientCredentials
-from src.utils.cache_manager import CACHE
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Event, Lock
+from typing import TYPE_CHECKING, Callable
 from src.utils.config_manager import CONFIG, PlaylistData
+from src.utils.http_session import fetch_bytes
+from src.utils.song_cache import SONG_CACHE
+from src.utils.spotify_api import SPOTIFY_API
+from src.utils.track_manifest import TrackManifest
+from src.utils.track_store import (
+    find_stored_track,
+    get_store_dir,
+    get_track_lock,
+    link_track,
+)
 from pathlib import Path
 
+# spotdl, spotipy and yt-dlp take long to import, they are only loaded once a
+# sync or search actually runs
+if TYPE_CHECKING:
+    from spotdl.download.downloader import Downloader
+    from spotdl.types.song import Song
+
+SPOTIFY_TRACK_URL = "https://open.spotify.com/track/"
+SNAPSHOT_WORKERS = 8
+COVER_WORKERS = 8
+# Pages of a user's playlists requested at the same time
+PAGE_WORKERS = 4
+
 spotdl = None
 spotipy_client = None
 
 client_id = None
 client_secret = None
 
+_init_lock = Lock()
+# Idle downloaders, one is checked out per running sync. Sync threads come and
+# go with every run, the downloaders (each with its own event loop) are reused
+_idle_downloaders: list["Downloader"] = []
+_downloaders_lock = Lock()
+
+# Plain callables, the GUI passes the emit of its Qt signals
+ProgressCallback = Callable[[list[str]], None]
+FoundPlaylistCallback = Callable[[PlaylistData, bytes], None]
+FoundCoverCallback = Callable[[str, bytes], None]
+
 
 def get_user_playlists(
     user_id: str,
-    found_playlist_signal: SignalInstance,
-    progress_signal: SignalInstance,
+    on_found_playlist: FoundPlaylistCallback,
+    on_progress: ProgressCallback,
     cancellation_flag: Event | None = None,
+    on_found_cover: FoundCoverCallback | None = None,
 ):
     print(f"\n== Starting playlist search for user id '{user_id}' ==")
 
+    import requests
+    from spotipy.client import SpotifyException
+
     global spotipy_client
 
     if cancellation_flag and cancellation_flag.is_set():
@@ -42,7 +73,7 @@ def get_user_playlists(
     try:
         if cancellation_flag and cancellation_flag.is_set():
             return
-        progress_signal.emit(["Loading playlists..."])
+        on_progress(["Loading playlists..."])
         results = spotipy_client.user_playlists(user_id)
     except SpotifyException as e:
         if "http status: 404" in str(e):
@@ -58,42 +89,98 @@ def get_user_playlists(
         else:
             raise
 
-    while results:
-        total = len(results["items"])
-        for i, playlist in enumerate(results["items"]):
-            progress_signal.emit([f"Loading playlists... ({i + 1}/{total})"])
-
-            if cancellation_flag and cancellation_flag.is_set():
-                return
-
-            playlist_data: PlaylistData = {
-                "priority": -1,
-                "owner": playlist["owner"]["display_name"],
-                "title": playlist["name"],
-                "total_tracks": playlist["tracks"]["total"],
-                "url": playlist["external_urls"]["spotify"],
-                "id": playlist["id"],
-                "cover_url": playlist["images"][0]["url"],
-                "enabled": True,
-            }
+    # Covers are fetched in the background, the playlists are listed right away
+    with ThreadPoolExecutor(max_workers=COVER_WORKERS) as cover_executor:
 
+        def fetch_cover(p_id: str, cover_url: str):
             if cancellation_flag and cancellation_flag.is_set():
                 return
 
-            response = requests.get(playlist_data.get("cover_url"))
-            cover_bytes = bytes()
-            if response.status_code == 200:
-                cover_bytes = response.content
+            # Only needed for covers, keeps the cache and Qt out of headless runs
+            from src.utils.cache_manager import make_thumbnail
 
-            found_playlist_signal.emit(playlist_data, cover_bytes)
+            cover_bytes = make_thumbnail(fetch_bytes(cover_url))
+            if cover_bytes and on_found_cover:
+                on_found_cover(p_id, cover_bytes)
 
-        if results["next"]:
-            results = spotipy_client.next(results)
-        else:
-            results = None
+        page_size = results.get("limit") or len(results["items"]) or 1
+        total = results.get("total") or len(results["items"])
 
+        def fetch_page(offset: int):
+            if cancellation_flag and cancellation_flag.is_set():
+                return None
 
-def download_cover_image(output_directory, p_id: str, cover_url: str) -> None:
+            try:
+                return spotipy_client.user_playlists(
+                    user_id, limit=page_size, offset=offset
+                )
+            except Exception as e:
+                print(f"Unable to load playlists of user '{user_id}' at {offset}: {e}")
+                return None
+
+        # The first page tells how many there are, the rest is requested at once
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as page_executor:
+            page_futures = []
+            if results["next"]:
+                page_futures = [
+                    page_executor.submit(fetch_page, offset)
+                    for offset in range(
+                        results.get("offset", 0) + page_size, total, page_size
+                    )
+                ]
+
+            def iter_pages():
+                # Pages are listed in order, each one as soon as it has landed
+                yield results
+                for future in page_futures:
+                    page = future.result()
+                    if page:
+                        yield page
+
+                # Playlists created while listing are past the expected total
+                page = page_futures[-1].result() if page_futures else None
+                while page and page.get("next"):
+                    page = spotipy_client.next(page)
+                    if page:
+                        yield page
+
+            loaded = 0
+            for page in iter_pages():
+                for playlist in page["items"]:
+                    loaded += 1
+                    on_progress([f"Loading playlists... ({loaded}/{total})"])
+
+                    if cancellation_flag and cancellation_flag.is_set():
+                        page_executor.shutdown(wait=False, cancel_futures=True)
+                        cover_executor.shutdown(wait=False, cancel_futures=True)
+                        return
+
+                    images = playlist.get("images") or [{}]
+
+                    playlist_data: PlaylistData = {
+                        "priority": -1,
+                        "owner": playlist["owner"]["display_name"],
+                        "title": playlist["name"],
+                        "total_tracks": playlist["tracks"]["total"],
+                        "url": playlist["external_urls"]["spotify"],
+                        "id": playlist["id"],
+                        "cover_url": images[0].get("url", ""),
+                        "enabled": True,
+                        "snapshot_id": "",
+                        "sync_interval_minutes": 0,
+                    }
+
+                    on_found_playlist(playlist_data, bytes())
+
+                    if on_found_cover:
+                        cover_executor.submit(
+                            fetch_cover,
+                            playlist_data["id"],
+                            playlist_data["cover_url"],
+                        )
+
+
+def download_cover_image(output_directory, cover_url: str) -> None:
     try:
         cover_image_path = os.path.join(output_directory, "cover.jpg")
 
@@ -101,16 +188,8 @@ def download_cover_image(output_directory, p_id: str, cover_url: str) -> None:
             print(f"Cover image already exists at: {cover_image_path}")
             return
 
-        cover_bytes = CACHE.get_cover(p_id)
-
-        if not cover_bytes:
-            response = requests.get(cover_url)
-            if response.status_code == 200:
-                cover_bytes = response.content
-            else:
-                print(
-                    f"Cover url GET request failed with status code {response.status_code} {response.reason}"
-                )
+        # The cache only keeps thumbnails, cover.jpg gets the full-size image
+        cover_bytes = fetch_bytes(cover_url)
 
         if not cover_bytes:
             print(f"Failed to download cover image: {cover_url}")
@@ -123,74 +202,105 @@ def download_cover_image(output_directory, p_id: str, cover_url: str) -> None:
         print(f"Faield to obtain playlist cover: {e}")
 
 
-def init_spotdl(output_directory: str):
+def init_spotdl():
+    from spotdl import Spotdl
+    from spotdl.utils.spotify import SpotifyClient
+
     global spotdl
 
-    if not spotdl:
-        # Initialise spotdl
-        global client_id
-        global client_secret
+    # Several playlists may sync at once, but the Spotify client is a singleton
+    with _init_lock:
+        if not spotdl:
+            # Initialise spotdl
+            global client_id
+            global client_secret
 
-        if not client_id or not client_secret:
-            get_spotdl_config()
+            if not client_id or not client_secret:
+                get_spotdl_config()
 
-        if not client_id or not client_secret:
-            print(
-                f"Unable to obtain client id and secret: client_id - {client_id} | client_secret - {client_secret}"
+            if not client_id or not client_secret:
+                print(
+                    f"Unable to obtain client id and secret: client_id - {client_id} | client_secret - {client_secret}"
+                )
+                return
+
+            spotdl = Spotdl(
+                client_id=client_id,
+                client_secret=client_secret,
             )
-            return
+            # spotdl resolves songs through its own client singleton
+            SPOTIFY_API.install(SpotifyClient())
 
-        spotdl = Spotdl(
-            client_id=client_id,
-            client_secret=client_secret,
-            downloader_settings={
-                "output": output_directory,
-            },
-        )
+        elif not isinstance(spotdl, Spotdl):
+            raise Exception(f"Error initialising Spotdl instance: {spotdl}")
 
-    elif isinstance(spotdl, Spotdl):
-        # Update output directory of current instance
-        spotdl.downloader.settings["output"] = output_directory
-    else:
-        raise Exception(f"Error initialising Spotdl instance: {spotdl}")
+
+def _acquire_downloader(output_directory: str) -> "Downloader":
+    """Downloader for a single sync, so concurrent syncs never share an output"""
+    from spotdl.download.downloader import Downloader
+
+    with _downloaders_lock:
+        downloader = _idle_downloaders.pop() if _idle_downloaders else None
+
+    # Only as many are ever created as playlists sync at the same time
+    if downloader is None:
+        downloader = Downloader(settings=dict(spotdl.downloader.settings))
+
+    downloader.settings["output"] = output_directory
+    return downloader
+
+
+def _release_downloader(downloader: "Downloader"):
+    with _downloaders_lock:
+        _idle_downloaders.append(downloader)
 
 
 def init_spotipy():
+    import spotipy
+    from spotipy.oauth2 import SpotifyClientCredentials
+
     global spotipy_client
 
     global client_id
     global client_secret
 
-    if not client_id or not client_secret:
-        get_spotdl_config()
+    with _init_lock:
+        if spotipy_client:
+            return
 
-    if not client_id or not client_secret:
-        print(
-            f"Unable to obtain client id and secret: client_id - {client_id} | client_secret - {client_secret}"
-        )
-        return
+        if not client_id or not client_secret:
+            get_spotdl_config()
 
-    auth_manager = SpotifyClientCredentials(
-        client_id=client_id, client_secret=client_secret
-    )
+        if not client_id or not client_secret:
+            print(
+                f"Unable to obtain client id and secret: client_id - {client_id} | client_secret - {client_secret}"
+            )
+            return
 
-    spotipy_client = spotipy.Spotify(auth_manager=auth_manager)
+        auth_manager = SpotifyClientCredentials(
+            client_id=client_id, client_secret=client_secret
+        )
+
+        spotipy_client = spotipy.Spotify(auth_manager=auth_manager)
+        SPOTIFY_API.install(spotipy_client)
 
 
 def syncPlaylist(
     playlist: PlaylistData,
     amount: int,
     playlist_index: int,
-    progress_signal: SignalInstance | None,
+    on_progress: ProgressCallback | None,
     cancellation_flag: Event | None = None,
-):
+    snapshot_id: str | None = None,
+) -> bool:
+    """Sync a playlist, returns whether every one of its tracks is on disk"""
     print(f"\n== Starting sync for '{playlist['title']}' ==")
 
     p_title = playlist["title"]
     p_url = playlist["url"]
 
-    if progress_signal:
-        progress_signal.emit(
+    if on_progress:
+        on_progress(
             [
                 f"Playlist: '{p_title}' ({playlist_index}/{amount})",
                 "...",
@@ -202,13 +312,13 @@ def syncPlaylist(
     output_directory = str(base_path / _sanitize_filename(p_title))
 
     # Get the spotdl instance
-    init_spotdl(output_directory)
+    init_spotdl()
 
     # Create folder for the playlist
     os.makedirs(output_directory, exist_ok=True)
 
-    if progress_signal:
-        progress_signal.emit(
+    if on_progress:
+        on_progress(
             [
                 f"Downloading cover of '{playlist['title']}'",
                 "...",
@@ -216,51 +326,258 @@ def syncPlaylist(
         )
 
     if cancellation_flag and cancellation_flag.is_set():
-        return
+        return False
 
     # Download the playlist cover
-    download_cover_image(
-        output_directory, playlist.get("id"), playlist.get("cover_url")
-    )
+    download_cover_image(output_directory, playlist.get("cover_url"))
 
     # Download each song from the playlist
     global spotdl
 
     if not spotdl:
         print(f"Error synchronizing playlists: Spotdl wasn't initialised ({spotdl})")
-        return
+        return False
+
+    # In library mode tracks are downloaded once into the shared store and linked
+    store_dir = None
+    if CONFIG.get_library_mode():
+        store_dir = get_store_dir(CONFIG.get_playlists_path())
+        downloader = _acquire_downloader(str(store_dir / "{track-id}.{output-ext}"))
+    else:
+        downloader = _acquire_downloader(output_directory)
+
+    manifest = TrackManifest(playlist["id"])
+    synced = False
 
     try:
         if cancellation_flag and cancellation_flag.is_set():
-            return
+            return False
 
-        songs = spotdl.search([p_url])
+        if snapshot_id is None:
+            snapshot_id = get_playlist_snapshot_ids([playlist["id"]]).get(
+                playlist["id"]
+            )
+
+        # List the track ids first so tracks already on disk are never resolved
+        track_ids = _get_playlist_track_ids(playlist["id"])
+
+        if track_ids is None:
+            songs = spotdl.search([p_url])
+            for song in songs:
+                SONG_CACHE.put(song.song_id, song.json)
+        else:
+            manifest.prune(track_ids)
+            missing_ids = [t_id for t_id in track_ids if not manifest.is_synced(t_id)]
+
+            if not missing_ids:
+                print(f"Playlist '{p_title}' is already up to date")
+                synced = True
+                return True
+
+            if cancellation_flag and cancellation_flag.is_set():
+                return False
+
+            songs = _resolve_songs(missing_ids)
 
         if not songs:
             print(f"Could not find playlist '{p_title}' with given Url")
-            return
+            return False
 
-        # Download each song
+        songs = [song for song in songs if not manifest.is_synced(song.song_id)]
+
+        # Download the missing songs, a few at a time
         total_tracks = len(songs)
-        for i, song in enumerate(songs):
+        workers = max(1, CONFIG.get_download_workers())
+
+        def download_song(index: int, song):
             if cancellation_flag and cancellation_flag.is_set():
-                return
+                return song, None
 
-            if progress_signal:
-                progress_signal.emit(
+            if on_progress:
+                on_progress(
                     [
                         f"Playlist: '{p_title}' ({playlist_index}/{amount})",
-                        f"Track: '{song.name}' ({i + 1}/{total_tracks})",
+                        f"Track: '{song.name}' ({index + 1}/{total_tracks})",
                     ]
                 )
 
-            download = spotdl.download(song)
-            print(f"Successfully downloaded: {song.name} at {download[1]}.")
+            if store_dir:
+                return _download_to_store(downloader, store_dir, output_directory, song)
+
+            # Bypass Spotdl.download, its event loop can't be shared between threads
+            return downloader.search_and_download(song)
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(download_song, i, song): song
+                for i, song in enumerate(songs)
+            }
+
+            try:
+                for future in as_completed(futures):
+                    if cancellation_flag and cancellation_flag.is_set():
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        return False
+
+                    try:
+                        song, path = future.result()
+                    except Exception as e:
+                        print(f"Error while downloading track of '{p_title}': {e}")
+                        SONG_CACHE.forget_match(futures[future].song_id)
+                        failed += 1
+                        continue
+
+                    if path:
+                        manifest.record(song.song_id, str(path))
+                        # Keep the provider match so the track is never searched again
+                        SONG_CACHE.put(song.song_id, song.json)
+                        print(f"Successfully downloaded: {song.name} at {path}.")
+                    else:
+                        SONG_CACHE.forget_match(song.song_id)
+                        failed += 1
+            except BaseException:
+                # Ctrl+C must not wait for every queued download to run
+                if cancellation_flag:
+                    cancellation_flag.set()
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+        synced = failed == 0
     except Exception as e:
         print(f"Error while synchronizing playlist '{p_title}': {e}")
+    finally:
+        _release_downloader(downloader)
+        manifest.save()
+
+        # Only a complete sync lets later runs skip the playlist while it is unchanged
+        if synced and snapshot_id:
+            CONFIG.set_playlist_snapshot(playlist["id"], snapshot_id)
+
+    return synced
+
+
+def get_playlist_snapshot_ids(
+    p_ids: list[str], cancellation_flag: Event | None = None
+) -> dict[str, str]:
+    """Fetch the current snapshot id of each playlist, without listing their tracks"""
+    global spotipy_client
+
+    if not spotipy_client:
+        init_spotipy()
+
+        if not spotipy_client:
+            return {}
+
+    def fetch_snapshot_id(p_id: str):
+        if cancellation_flag and cancellation_flag.is_set():
+            return p_id, None
+
+        try:
+            result = spotipy_client.playlist(p_id, fields="snapshot_id")
+            return p_id, result.get("snapshot_id")
+        except Exception as e:
+            print(f"Unable to get snapshot id of playlist '{p_id}': {e}")
+            return p_id, None
+
+    snapshot_ids = {}
+    with ThreadPoolExecutor(max_workers=SNAPSHOT_WORKERS) as executor:
+        for p_id, snapshot_id in executor.map(fetch_snapshot_id, p_ids):
+            if snapshot_id:
+                snapshot_ids[p_id] = snapshot_id
+
+    return snapshot_ids
+
+
+def _resolve_songs(track_ids: list[str]) -> list["Song"]:
+    """Get the spotdl songs of the given tracks, only resolving the ones not cached"""
+    from spotdl.types.song import Song
+
+    cached_songs: dict[str, Song] = {}
+    for t_id in track_ids:
+        song_data = SONG_CACHE.get(t_id)
+        if song_data:
+            try:
+                cached_songs[t_id] = Song.from_dict(song_data)
+            except Exception as e:
+                print(f"Ignoring invalid cached song {t_id}: {e}")
+
+    uncached_ids = [t_id for t_id in track_ids if t_id not in cached_songs]
+    if uncached_ids:
+        for song in spotdl.search([SPOTIFY_TRACK_URL + t_id for t_id in uncached_ids]):
+            SONG_CACHE.put(song.song_id, song.json)
+            cached_songs[song.song_id] = song
+
+    return [cached_songs[t_id] for t_id in track_ids if t_id in cached_songs]
+
+
+def _download_to_store(
+    downloader: "Downloader", store_dir: Path, output_directory: str, song
+):
+    """Fetch the track into the shared store if needed and link it into the playlist"""
+    from spotdl.utils.formatter import create_file_name
+
+    with get_track_lock(song.song_id):
+        stored_path = find_stored_track(store_dir, song.song_id)
+
+        if stored_path is None:
+            song, stored_path = downloader.search_and_download(song)
+
+            if not stored_path:
+                return song, None
+
+    stored_path = Path(stored_path)
+    target_path = create_file_name(
+        song, output_directory, stored_path.suffix.lstrip(".")
+    )
+
+    return song, link_track(stored_path, target_path)
+
+
+def _get_playlist_track_ids(p_id: str) -> list[str] | None:
+    """Cheap listing of the track ids of a playlist, without resolving them"""
+    global spotipy_client
+
+    if not spotipy_client:
+        init_spotipy()
+
+        if not spotipy_client:
+            return None
+
+    try:
+        track_ids = []
+        results = spotipy_client.playlist_items(
+            p_id,
+            fields="items(track(id,type,is_local)),next",
+            additional_types=("track",),
+        )
+
+        while results:
+            for item in results["items"]:
+                track = item.get("track")
+                if (
+                    track
+                    and track.get("id")
+                    and track.get("type") == "track"
+                    and not track.get("is_local")
+                ):
+                    track_ids.append(track["id"])
+
+            if results["next"]:
+                results = spotipy_client.next(results)
+            else:
+                results = None
+
+        # Keep the playlist order but skip duplicated entries
+        return list(dict.fromkeys(track_ids))
+    except Exception as e:
+        print(f"Unable to list tracks of playlist '{p_id}': {e}")
+        return None
 
 
 def get_spotdl_config():
+    import spotdl.utils.config as spotDlConfig
+
     # Get the configuration
     config = None
 
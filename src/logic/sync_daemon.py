@@ -0,0 +1,191 @@
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Event
+from typing import Literal
+from src.logic.spotdl_commands import (
+    ProgressCallback,
+    get_playlist_snapshot_ids,
+    init_spotdl,
+)
+from src.logic.sync_scheduler import sync_playlist
+from src.utils.config_manager import CONFIG, PlaylistData
+from src.utils.song_cache import SONG_CACHE
+
+SyncOutcome = Literal["synced", "unchanged", "failed"]
+
+# Longest the loop sleeps, so config changes and stop requests are picked up
+POLL_SECONDS = 5
+# First runs after a start are spread over this window instead of all at once
+STARTUP_SPREAD_MINUTES = 10
+# Every delay is randomly stretched or shrunk by up to this fraction
+JITTER = 0.1
+# Playlists unchanged run after run are checked up to this many times less often
+MAX_UNCHANGED_BACKOFF = 8
+# Failed syncs are retried after this delay, doubled on every new failure
+RETRY_BASE_MINUTES = 5
+MAX_RETRY_MINUTES = 24 * 60
+# The song cache is written at most this often, not after every sync
+SONG_CACHE_SAVE_SECONDS = 10 * 60
+
+
+class PlaylistSchedule:
+    """When a playlist syncs next, and how its last runs went"""
+
+    def __init__(self, interval_minutes: int, next_run: float):
+        self.interval_minutes = interval_minutes
+        self.next_run = next_run
+        self.unchanged_runs = 0
+        self.failures = 0
+
+    def reschedule(self, outcome: SyncOutcome, now: float):
+        if outcome == "failed":
+            self.failures += 1
+            delay = min(
+                RETRY_BASE_MINUTES * 2 ** (self.failures - 1), MAX_RETRY_MINUTES
+            )
+        elif outcome == "unchanged":
+            self.failures = 0
+            self.unchanged_runs += 1
+            backoff = min(2 ** (self.unchanged_runs - 1), MAX_UNCHANGED_BACKOFF)
+            delay = self.interval_minutes * backoff
+        else:
+            self.failures = 0
+            self.unchanged_runs = 0
+            delay = self.interval_minutes
+
+        self.next_run = now + _jittered(delay * 60)
+
+
+class SyncDaemon:
+    """
+    Keeps the enabled playlists synced, each one on its own interval.
+
+    A single warm Spotdl instance serves every run. Playlists that keep failing
+    or don't change are backed off, and all delays are jittered so the syncs
+    spread out instead of lining up.
+    """
+
+    def __init__(
+        self,
+        on_progress: ProgressCallback | None,
+        stop_event: Event | None = None,
+        max_concurrent: int | None = None,
+    ):
+        self.on_progress = on_progress
+        self.stop_event = stop_event or Event()
+        self.max_concurrent = max_concurrent or CONFIG.get_max_concurrent_playlists()
+        self._schedules: dict[str, PlaylistSchedule] = {}
+
+    def run(self):
+        """Sync due playlists until the stop event is set"""
+        # Loading spotdl is slow, it's done once for the daemon's whole life
+        init_spotdl()
+
+        running: dict[str, Future] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, self.max_concurrent), thread_name_prefix="daemon-sync"
+        )
+
+        last_cache_save = time.monotonic()
+
+        try:
+            while not self.stop_event.is_set():
+                now = time.monotonic()
+
+                if now - last_cache_save >= SONG_CACHE_SAVE_SECONDS:
+                    SONG_CACHE.save()
+                    last_cache_save = now
+
+                for p_id, future in list(running.items()):
+                    if not future.done():
+                        continue
+
+                    del running[p_id]
+                    schedule = self._schedules.get(p_id)
+                    if schedule:
+                        schedule.reschedule(future.result(), now)
+                        print(
+                            f"Next sync of playlist '{p_id}' in "
+                            f"{(schedule.next_run - now) / 60:.0f} minutes"
+                        )
+
+                playlists = CONFIG.get_enabled_playlists()
+                self._update_schedules(playlists, now)
+
+                # Enabled playlists come in priority order, so it decides who goes first
+                for playlist in playlists:
+                    if len(running) >= self.max_concurrent:
+                        break
+
+                    p_id = playlist["id"]
+                    if p_id in running or self._schedules[p_id].next_run > now:
+                        continue
+
+                    running[p_id] = executor.submit(self._sync, playlist)
+
+                # With every slot taken only a finished sync can start another
+                timeout = POLL_SECONDS
+                waiting = [
+                    schedule.next_run
+                    for p_id, schedule in self._schedules.items()
+                    if p_id not in running
+                ]
+                if waiting and len(running) < self.max_concurrent:
+                    timeout = min(max(min(waiting) - now, 0), POLL_SECONDS)
+
+                if running:
+                    wait(running.values(), timeout=timeout, return_when=FIRST_COMPLETED)
+                else:
+                    self.stop_event.wait(timeout)
+        finally:
+            # Running syncs use the stop event as their cancellation flag
+            self.stop_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            SONG_CACHE.save()
+
+    def _update_schedules(self, playlists: list[PlaylistData], now: float):
+        """Schedule new playlists, drop removed ones and follow interval changes"""
+        enabled_ids = set()
+
+        for playlist in playlists:
+            p_id = playlist["id"]
+            enabled_ids.add(p_id)
+            interval = CONFIG.get_playlist_sync_interval(playlist)
+
+            schedule = self._schedules.get(p_id)
+            if schedule is None:
+                spread = min(interval, STARTUP_SPREAD_MINUTES) * 60
+                self._schedules[p_id] = PlaylistSchedule(
+                    interval, now + random.uniform(0, spread)
+                )
+            elif schedule.interval_minutes != interval:
+                schedule.interval_minutes = interval
+                schedule.next_run = min(
+                    schedule.next_run, now + _jittered(interval * 60)
+                )
+
+        for p_id in self._schedules.keys() - enabled_ids:
+            del self._schedules[p_id]
+
+    def _sync(self, playlist: PlaylistData) -> SyncOutcome:
+        try:
+            # One cheap request tells whether the playlist changed since last time
+            snapshot_id = get_playlist_snapshot_ids(
+                [playlist["id"]], self.stop_event
+            ).get(playlist["id"], "")
+
+            if snapshot_id and snapshot_id == playlist.get("snapshot_id"):
+                return "unchanged"
+
+            synced = sync_playlist(
+                playlist, 1, 1, self.on_progress, self.stop_event, snapshot_id
+            )
+            return "synced" if synced else "failed"
+        except Exception as e:
+            print(f"Error while synchronizing playlist '{playlist.get('title')}': {e}")
+            return "failed"
+
+
+def _jittered(seconds: float) -> float:
+    return seconds * random.uniform(1 - JITTER, 1 + JITTER)
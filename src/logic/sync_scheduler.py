@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Condition, Event
+from src.logic.spotdl_commands import (
+    ProgressCallback,
+    get_playlist_snapshot_ids,
+    syncPlaylist,
+)
+from src.utils.config_manager import CONFIG, PlaylistData
+from src.utils.song_cache import SONG_CACHE
+from src.utils.spotify_api import SPOTIFY_API
+
+# How often a sync waiting for a free slot checks whether it was cancelled
+SLOT_POLL_SECONDS = 0.5
+
+
+class PlaylistSyncSlots:
+    """
+    Playlists syncing in this process, whoever started them.
+
+    Sync All, card syncs, the CLI and the daemon all go through here, so the
+    max_concurrent_playlists cap holds overall and a playlist never syncs twice
+    at once (each run saves its own manifest, the last one would win).
+    """
+
+    def __init__(self):
+        self._condition = Condition()
+        self._active: set[str] = set()
+
+    def acquire(self, p_id: str, cancellation_flag: Event | None = None) -> bool:
+        """Wait for a free slot, False if the playlist is already syncing"""
+        with self._condition:
+            while True:
+                if p_id in self._active:
+                    return False
+                if cancellation_flag and cancellation_flag.is_set():
+                    return False
+                if len(self._active) < max(1, CONFIG.get_max_concurrent_playlists()):
+                    self._active.add(p_id)
+                    return True
+
+                self._condition.wait(SLOT_POLL_SECONDS)
+
+    def release(self, p_id: str):
+        with self._condition:
+            self._active.discard(p_id)
+            self._condition.notify_all()
+
+
+SYNC_SLOTS = PlaylistSyncSlots()
+
+
+def sync_playlist(
+    playlist: PlaylistData,
+    amount: int,
+    playlist_index: int,
+    on_progress: ProgressCallback | None,
+    cancellation_flag: Event | None = None,
+    snapshot_id: str | None = None,
+) -> bool:
+    """syncPlaylist within the global cap, returns whether it completed"""
+    p_id = playlist["id"]
+    if not SYNC_SLOTS.acquire(p_id, cancellation_flag):
+        if not (cancellation_flag and cancellation_flag.is_set()):
+            print(f"Playlist '{playlist.get('title')}' is already being synced")
+        return False
+
+    try:
+        return syncPlaylist(
+            playlist,
+            amount,
+            playlist_index,
+            on_progress,
+            cancellation_flag,
+            snapshot_id,
+        )
+    finally:
+        SYNC_SLOTS.release(p_id)
+
+
+def sync_playlists(
+    playlists: list[PlaylistData],
+    on_progress: ProgressCallback | None,
+    cancellation_flag: Event | None = None,
+    max_concurrent: int | None = None,
+):
+    """Sync the enabled playlists, several at once, starting by the highest priority"""
+    enabled_playlists = sorted(
+        (playlist for playlist in playlists if playlist.get("enabled")),
+        key=lambda playlist: playlist.get("priority", 0),
+    )
+
+    if not enabled_playlists:
+        return
+
+    # Cheap pre-pass: playlists whose snapshot didn't change since their last
+    # complete sync are skipped before any track gets resolved
+    if on_progress:
+        on_progress(["Checking playlists for changes...", "..."])
+
+    snapshot_ids = get_playlist_snapshot_ids(
+        [playlist["id"] for playlist in enabled_playlists], cancellation_flag
+    )
+
+    if cancellation_flag and cancellation_flag.is_set():
+        return
+
+    changed_playlists = [
+        playlist
+        for playlist in enabled_playlists
+        if not playlist.get("snapshot_id")
+        or snapshot_ids.get(playlist["id"]) != playlist.get("snapshot_id")
+    ]
+
+    skipped = len(enabled_playlists) - len(changed_playlists)
+    if skipped:
+        print(f"Skipping {skipped} unchanged playlists")
+
+    amount = len(changed_playlists)
+    if not amount:
+        return
+
+    if max_concurrent is None:
+        max_concurrent = CONFIG.get_max_concurrent_playlists()
+
+    # Jobs are picked up in submission order, so priority decides who starts first
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_concurrent, amount)),
+        thread_name_prefix="playlist-sync",
+    ) as executor:
+        futures = {
+            executor.submit(
+                sync_playlist,
+                playlist,
+                amount,
+                index + 1,
+                on_progress,
+                cancellation_flag,
+                snapshot_ids.get(playlist["id"], ""),
+            ): playlist
+            for index, playlist in enumerate(changed_playlists)
+        }
+
+        try:
+            for future in as_completed(futures):
+                if cancellation_flag and cancellation_flag.is_set():
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    return
+
+                try:
+                    future.result()
+                except Exception as e:
+                    print(
+                        f"Error while synchronizing playlist '{futures[future].get('title')}': {e}"
+                    )
+        except BaseException:
+            # Ctrl+C must not wait for every queued playlist to sync
+            if cancellation_flag:
+                cancellation_flag.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        finally:
+            # Written once for the whole run rather than after every playlist
+            SONG_CACHE.save()
+
+    # Counters are kept for the whole process, printed after every full run
+    SPOTIFY_API.print_stats()
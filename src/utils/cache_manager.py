@@ -1,34 +1,270 @@
+import atexit
+import json
+import mmap
 import os
+import time
+from threading import RLock
+
+# Covers are only ever shown at this size, the full image lives in each playlist folder
+THUMBNAIL_SIZE = 90
+THUMBNAIL_QUALITY = 85
+
+# Least recently used covers are evicted above this size
+MAX_PACK_BYTES = 32 * 1024 * 1024
+# Dead space tolerated in the pack file before it gets compacted
+MIN_COMPACTION_BYTES = 1024 * 1024
 
 
 class CacheManager:
-    CACHE_DIR = "cache/covers"
+    """
+    Covers packed in a single data file plus an index of id -> [offset, length, last use].
+
+    New covers are appended, replaced or removed ones become dead space that is
+    reclaimed by compaction once it outweighs the live data.
+    """
+
+    CACHE_DIR = "cache"
+    PACK_PATH = "cache/covers.pack"
+    INDEX_PATH = "cache/covers.idx"
+    LEGACY_CACHE_DIRS = ("cache/thumbnails", "cache/covers")
+
+    def __init__(self, max_bytes: int = MAX_PACK_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = RLock()
+        self._mmap: mmap.mmap | None = None
+        self._mmap_size = 0
+        self._index_dirty = False
+
+        os.makedirs(self.CACHE_DIR, exist_ok=True)
+        if not os.path.exists(self.PACK_PATH):
+            open(self.PACK_PATH, "wb").close()
 
-    def __init__(self):
-        if not os.path.exists(self.CACHE_DIR):
-            os.makedirs(self.CACHE_DIR, exist_ok=True)
+        self._index: dict[str, list] = self._load_index()
+        self._migrate_legacy_covers()
+
+        atexit.register(self.flush)
+
+    # --- READS ---
+
+    def has_cover(self, file_name: str) -> bool:
+        with self._lock:
+            return file_name in self._index
 
     def get_cover(self, file_name: str):
-        cache_path = os.path.join(self.CACHE_DIR, f"{file_name}.jpg")
-        if os.path.exists(cache_path):
-            with open(cache_path, "rb") as f:
-                return f.read()
-        return None
+        with self._lock:
+            entry = self._index.get(file_name)
+            if entry is None:
+                return None
+
+            entry[2] = time.time()
+            self._index_dirty = True
+            return self._read(entry[0], entry[1])
+
+    def get_covers(self, file_names: list[str]) -> dict[str, bytes]:
+        """Bulk read of many covers in a single pass over the pack file"""
+        with self._lock:
+            now = time.time()
+            entries = [
+                (file_name, self._index[file_name])
+                for file_name in file_names
+                if file_name in self._index
+            ]
+            entries.sort(key=lambda item: item[1][0])
+
+            covers = {}
+            for file_name, entry in entries:
+                entry[2] = now
+                covers[file_name] = self._read(entry[0], entry[1])
+
+            if entries:
+                self._index_dirty = True
+            return covers
+
+    def _read(self, offset: int, length: int) -> bytes:
+        pack_size = os.path.getsize(self.PACK_PATH)
+        if offset + length > pack_size:
+            return bytes()
+
+        # Remap once the pack file grew past the mapped region
+        if self._mmap is None or self._mmap_size < offset + length:
+            self._close_mmap()
+            with open(self.PACK_PATH, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmap_size = pack_size
+
+        return self._mmap[offset : offset + length]
+
+    # --- WRITES ---
 
     def save_cover(self, cover_bytes: bytes, file_name: str):
         if not cover_bytes:
             return
-        cache_path = os.path.join(self.CACHE_DIR, f"{file_name}.jpg")
-        with open(cache_path, "wb") as f:
-            f.write(cover_bytes)
+
+        thumbnail = make_thumbnail(cover_bytes)
+
+        with self._lock:
+            # Re-saving an unchanged cover must not grow the pack
+            entry = self._index.get(file_name)
+            if entry and entry[1] == len(thumbnail):
+                if self._read(entry[0], entry[1]) == thumbnail:
+                    return
+
+            with open(self.PACK_PATH, "ab") as f:
+                offset = f.tell()
+                f.write(thumbnail)
+
+            self._index[file_name] = [offset, len(thumbnail), time.time()]
+            self._index_dirty = True
+            self._evict()
 
     def delete_cache_of_playlist(self, file_name: str):
-        cache_path = os.path.join(self.CACHE_DIR, f"{file_name}.jpg")
+        with self._lock:
+            if self._index.pop(file_name, None) is not None:
+                self._index_dirty = True
+                self._compact_if_needed()
+
+    def flush(self):
+        """Persist the index, covers appended since the last flush are kept"""
+        with self._lock:
+            if not self._index_dirty:
+                return
+
+            tmp_path = f"{self.INDEX_PATH}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._index, f)
+                os.replace(tmp_path, self.INDEX_PATH)
+                self._index_dirty = False
+            except OSError as e:
+                print(f"Error saving cover index {self.INDEX_PATH}: {e}")
+
+    # --- MAINTENANCE ---
+
+    def _live_bytes(self) -> int:
+        return sum(entry[1] for entry in self._index.values())
+
+    def _evict(self):
+        live_bytes = self._live_bytes()
+        if live_bytes > self.max_bytes:
+            least_used = sorted(self._index, key=lambda name: self._index[name][2])
+            for file_name in least_used:
+                if live_bytes <= self.max_bytes:
+                    break
+                live_bytes -= self._index.pop(file_name)[1]
+
+        self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        live_bytes = self._live_bytes()
+        dead_bytes = os.path.getsize(self.PACK_PATH) - live_bytes
+
+        if dead_bytes > MIN_COMPACTION_BYTES and dead_bytes > live_bytes:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the pack file with only the live covers"""
+        with self._lock:
+            entries = sorted(self._index.items(), key=lambda item: item[1][0])
+            covers = [
+                (name, entry, self._read(entry[0], entry[1]))
+                for name, entry in entries
+            ]
+
+            # The pack can't be replaced while it is still mapped (Windows)
+            self._close_mmap()
+
+            tmp_path = f"{self.PACK_PATH}.tmp"
+            new_index = {}
+            try:
+                with open(tmp_path, "wb") as f:
+                    for file_name, entry, cover_bytes in covers:
+                        new_index[file_name] = [f.tell(), len(cover_bytes), entry[2]]
+                        f.write(cover_bytes)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.PACK_PATH)
+            except OSError as e:
+                print(f"Error compacting cover pack {self.PACK_PATH}: {e}")
+                return
+
+            self._index = new_index
+            self._index_dirty = True
+            self.flush()
+
+    def _close_mmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self._mmap_size = 0
+
+    def _load_index(self) -> dict[str, list]:
         try:
-            if os.path.exists(cache_path):
-                os.remove(cache_path)
-        except OSError as e:
-            print(f"Error deleting cache file {cache_path}: {e}")
+            with open(self.INDEX_PATH, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        # Drop entries pointing past the data that actually reached the disk
+        pack_size = os.path.getsize(self.PACK_PATH)
+        return {
+            name: entry
+            for name, entry in index.items()
+            if entry[0] + entry[1] <= pack_size
+        }
+
+    def _migrate_legacy_covers(self):
+        """Pack the one file per playlist covers cached by older versions"""
+        for legacy_dir in self.LEGACY_CACHE_DIRS:
+            if not os.path.isdir(legacy_dir):
+                continue
+
+            for entry in os.scandir(legacy_dir):
+                file_name, ext = os.path.splitext(entry.name)
+                if ext != ".jpg":
+                    continue
+
+                try:
+                    if file_name not in self._index:
+                        with open(entry.path, "rb") as f:
+                            self.save_cover(f.read(), file_name)
+                    os.remove(entry.path)
+                except OSError as e:
+                    print(f"Error migrating cache file {entry.path}: {e}")
+
+            try:
+                os.rmdir(legacy_dir)
+            except OSError:
+                pass
+
+        self.flush()
+
+
+def make_thumbnail(cover_bytes: bytes, size: int = THUMBNAIL_SIZE) -> bytes:
+    """Downscale an encoded cover to a small JPEG, as is if it can't be decoded"""
+    try:
+        from PySide6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+        from PySide6.QtGui import QImage
+    except ImportError:
+        return cover_bytes
+
+    image = QImage.fromData(cover_bytes)
+    if image.isNull() or (image.width() <= size and image.height() <= size):
+        return cover_bytes
+
+    image = image.scaled(
+        size,
+        size,
+        Qt.AspectRatioMode.KeepAspectRatio,
+        Qt.TransformationMode.SmoothTransformation,
+    )
+
+    thumbnail_data = QByteArray()
+    buffer = QBuffer(thumbnail_data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "JPG", THUMBNAIL_QUALITY)
+    buffer.close()
+
+    return bytes(thumbnail_data.data())
 
 
 CACHE = CacheManager()
@@ -1,13 +1,27 @@
+import atexit
+import copy
 import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import TypedDict, cast
+from threading import RLock, Timer
+from typing import Literal, TypedDict, cast
+from src.utils.library_store import SqliteLibraryStore
+from src.utils.priority_order import PriorityOrder
 
 # Define the path to your config file
 CONFIG_FILE_PATH = Path("data.json")
+JOURNAL_FILE_PATH = Path("data.journal")
+
+# The journal is folded into the snapshot once it holds this many changes
+MAX_JOURNAL_ENTRIES = 1000
+
+# Changes made within this delay are written together
+SAVE_DELAY_SECONDS = 0.5
 
 
 class PlaylistData(TypedDict):
-    priority: int
+    priority: float
     owner: str
     title: str
     total_tracks: int
@@ -15,50 +29,217 @@ class PlaylistData(TypedDict):
     id: str
     enabled: bool
     cover_url: str
+    snapshot_id: str
+    # Minutes between daemon syncs, 0 uses the configured default
+    sync_interval_minutes: int
 
 
 class ConfigSchema(TypedDict):
     username: str
     playlists_location: str
+    download_workers: int
+    max_concurrent_playlists: int
+    library_mode: bool
+    storage_backend: Literal["json", "sqlite"]
+    sync_interval_minutes: int
     playlists: dict[str, PlaylistData]
 
 
 DEFAULT_CONFIG: ConfigSchema = {
     "username": "Spotify",
     "playlists_location": "playlists/",
+    "download_workers": 4,
+    "max_concurrent_playlists": 3,
+    "library_mode": False,
+    "storage_backend": "json",
+    "sync_interval_minutes": 360,
     "playlists": {},
 }
 
 
 class ConfigManager:
+    """
+    Config stored as a snapshot (data.json) plus an append-only journal of the
+    changes made since, which is replayed on startup and compacted periodically.
+    """
+
     def __init__(self):
+        # Playlists syncing in parallel may save at the same time
+        self._lock = RLock()
+        self._pending_changes: list[str] = []
+        self._journal_entries = 0
+        self._batch_depth = 0
+        self._save_timer: Timer | None = None
         self._data: ConfigSchema = self._load_config()
 
+        # Large libraries keep their playlists in SQLite instead of the JSON
+        self._library: SqliteLibraryStore | None = None
+        if self._data.get("storage_backend") == "sqlite":
+            self._open_library_store()
+
+        # Playlist ids sorted by priority, kept up to date by the setters
+        self._order = PriorityOrder({})
+        self._load_order()
+
+        # Pending changes must reach the disk before the app exits
+        atexit.register(self.flush)
+
     def _load_config(self):
+        data = copy.deepcopy(DEFAULT_CONFIG)
+        needs_compaction = False
+
         try:
             with open(CONFIG_FILE_PATH, "r") as f:
-                data = json.load(f)
-                merged_config = cast(ConfigSchema, {**DEFAULT_CONFIG, **data})
-                return merged_config
+                data = cast(ConfigSchema, {**data, **json.load(f)})
         except (FileNotFoundError, json.JSONDecodeError):
             print(
                 f"Config file not found or invalid. Creating default config at {CONFIG_FILE_PATH}"
             )
-            self._save_config(DEFAULT_CONFIG)
-            return DEFAULT_CONFIG
+            needs_compaction = True
 
-    def _save_config(self, data):
+        # Replay the changes made after the snapshot was written
+        try:
+            with open(JOURNAL_FILE_PATH, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn tail of a write interrupted by a crash
+                        needs_compaction = True
+                        break
+
+                    _apply_change(data, change)
+                    self._journal_entries += 1
+        except FileNotFoundError:
+            pass
+
+        if needs_compaction:
+            self._compact(data)
+
+        return data
+
+    def _commit(self, change: dict):
+        """Apply a change in memory and queue it for the journal"""
+        with self._lock:
+            _apply_change(self._data, change)
+            self._pending_changes.append(json.dumps(change))
+            self._save_config()
+
+    def _save_config(self):
+        """Schedule the pending changes to be written once they settle"""
+        with self._lock:
+            if self._batch_depth or self._save_timer is not None:
+                return
+
+            self._save_timer = Timer(SAVE_DELAY_SECONDS, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _open_library_store(self):
+        self._library = SqliteLibraryStore()
+
+        # One-shot migration of the playlists still held in data.json
+        json_playlists = self._data.get("playlists")
+        if json_playlists:
+            print(f"Migrating {len(json_playlists)} playlists to SQLite")
+            self._library.replace_all(json_playlists)
+            self._commit({"op": "set", "key": "playlists", "value": {}})
+            self.flush()
+            self.compact()
+
+    def _load_order(self):
+        if self._library:
+            ranks = dict(self._library.get_priorities())
+        else:
+            ranks = {
+                p_id: playlist.get("priority", 0)
+                for p_id, playlist in self._data["playlists"].items()
+            }
+        self._order = PriorityOrder(ranks)
+
+    def get_library_store(self):
+        """Get the SQLite store when it is the configured backend"""
+        return self._library
+
+    @contextmanager
+    def batch(self):
+        """Group the changes made inside the block into a single write"""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            if self._library:
+                with self._library.batch():
+                    yield self
+            else:
+                yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                finished = self._batch_depth == 0
+
+            if finished:
+                self.flush()
+
+    def flush(self):
+        """Append pending changes to the journal right away"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+
+            if not self._pending_changes:
+                return
+
+            try:
+                with open(JOURNAL_FILE_PATH, "a", encoding="utf-8") as f:
+                    f.write("".join(f"{change}\n" for change in self._pending_changes))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                print(f"Error saving config journal: {e}")
+                return
+
+            self._journal_entries += len(self._pending_changes)
+            self._pending_changes.clear()
+
+            if self._journal_entries >= MAX_JOURNAL_ENTRIES:
+                self.compact()
+
+    def compact(self):
+        """Fold the journal into a new snapshot"""
+        self._compact(self._data)
+
+    def _compact(self, data):
+        with self._lock:
+            if not self._write_snapshot(data):
+                return
+
+            # Replaying an old journal over the new snapshot is harmless, so a
+            # crash before the truncation loses nothing
+            try:
+                open(JOURNAL_FILE_PATH, "w").close()
+                self._journal_entries = 0
+            except OSError as e:
+                print(f"Error truncating config journal: {e}")
+
+    def _write_snapshot(self, data) -> bool:
+        tmp_path = CONFIG_FILE_PATH.with_name(f"{CONFIG_FILE_PATH.name}.tmp")
         try:
             playlist_items = data["playlists"].items()
             sorted_playlists = sorted(
-                playlist_items, key=lambda item: item[1]["priority"], reverse=False
+                playlist_items,
+                key=lambda item: item[1].get("priority", 0),
+                reverse=False,
             )
-            ordered_playlists_dict = dict(sorted_playlists)
-            data["playlists"] = ordered_playlists_dict
-            with open(CONFIG_FILE_PATH, "w") as f:
-                json.dump(data, f, indent=2)
+            with open(tmp_path, "w") as f:
+                json.dump({**data, "playlists": dict(sorted_playlists)}, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, CONFIG_FILE_PATH)
+            return True
         except IOError as e:
             print(f"Error saving config file: {e}")
+            return False
 
     # --- GETTERS ---
 
@@ -70,17 +251,73 @@ class ConfigManager:
         """Get the configured path to sync playlists"""
         return self._data.get("playlists_location", "")
 
+    def get_download_workers(self):
+        """Get the amount of tracks downloaded at the same time"""
+        return self._data.get("download_workers", DEFAULT_CONFIG["download_workers"])
+
+    def get_max_concurrent_playlists(self):
+        """Get the amount of playlists synced at the same time"""
+        return self._data.get(
+            "max_concurrent_playlists", DEFAULT_CONFIG["max_concurrent_playlists"]
+        )
+
+    def get_library_mode(self):
+        """Get whether tracks are shared between playlists through a single store"""
+        return self._data.get("library_mode", DEFAULT_CONFIG["library_mode"])
+
+    def get_storage_backend(self):
+        """Get where the playlists are stored, data.json or SQLite"""
+        return self._data.get("storage_backend", DEFAULT_CONFIG["storage_backend"])
+
+    def get_sync_interval(self):
+        """Get the default minutes between daemon syncs of a playlist"""
+        return self._data.get(
+            "sync_interval_minutes", DEFAULT_CONFIG["sync_interval_minutes"]
+        )
+
+    def get_playlist_sync_interval(self, playlist: PlaylistData) -> int:
+        """Get the minutes between daemon syncs of the given playlist"""
+        return playlist.get("sync_interval_minutes") or self.get_sync_interval()
+
     def get_all_playlists(self):
         """Get all saved playlists"""
+        if self._library:
+            return self._library.get_all()
         return self._data.get("playlists", None)
 
     def get_playlist(self, p_id: str):
         """Get a specific playlist with given id"""
+        if self._library:
+            return self._library.get(p_id)
+
         playlists = self.get_all_playlists()
         if playlists is None:
             return None
         return playlists.get(p_id)
 
+    def get_ordered_playlists(self) -> list[PlaylistData]:
+        """Get all saved playlists ordered by priority"""
+        if self._library:
+            return list(self._library.get_all().values())
+
+        # Playlists may be added from task workers while the order is read
+        with self._lock:
+            playlists = self._data.get("playlists", {})
+            return [playlists[p_id] for p_id in self._order.ids()]
+
+    def get_enabled_playlists(self) -> list[PlaylistData]:
+        """Get the enabled playlists ordered by priority"""
+        if self._library:
+            return self._library.get_enabled()
+
+        with self._lock:
+            playlists = self._data.get("playlists", {})
+            return [
+                playlists[p_id]
+                for p_id in self._order.ids()
+                if playlists[p_id].get("enabled")
+            ]
+
     def get_all(self):
         """Return the entire config dictionary."""
         return self._data
@@ -89,48 +326,182 @@ class ConfigManager:
 
     def set_username(self, new_username: str):
         """Set a new username value"""
-        self._data["username"] = new_username
-        self._save_config(self._data)
+        self._commit({"op": "set", "key": "username", "value": new_username})
 
     def set_playlists_path(self, new_path: str):
         """Set the path to sync playlists"""
-        self._data["playlists_location"] = new_path
-        self._save_config(self._data)
+        self._commit({"op": "set", "key": "playlists_location", "value": new_path})
+
+    def set_download_workers(self, workers: int):
+        """Set the amount of tracks downloaded at the same time"""
+        self._commit(
+            {"op": "set", "key": "download_workers", "value": max(1, workers)}
+        )
+
+    def set_max_concurrent_playlists(self, amount: int):
+        """Set the amount of playlists synced at the same time"""
+        self._commit(
+            {"op": "set", "key": "max_concurrent_playlists", "value": max(1, amount)}
+        )
+
+    def set_sync_interval(self, minutes: int):
+        """Set the default minutes between daemon syncs of a playlist"""
+        self._commit(
+            {"op": "set", "key": "sync_interval_minutes", "value": max(1, minutes)}
+        )
+
+    def set_library_mode(self, enabled: bool):
+        """Set whether tracks are shared between playlists through a single store"""
+        self._commit({"op": "set", "key": "library_mode", "value": enabled})
+
+    def set_storage_backend(self, backend: Literal["json", "sqlite"]):
+        """Set where the playlists are stored, moving them over"""
+        with self._lock:
+            if backend == self.get_storage_backend():
+                return
+
+            if backend == "sqlite":
+                self._commit({"op": "set", "key": "storage_backend", "value": backend})
+                self._open_library_store()
+            elif self._library:
+                # Imported here, the manifests module depends on this one
+                from src.utils.track_manifest import write_manifest_file
+
+                playlists = self._library.get_all()
+
+                # Saving to SQLite deleted the JSON manifests, without them every
+                # track would be resolved and downloaded again
+                for p_id in playlists:
+                    tracks = self._library.get_tracks(p_id)
+                    if tracks:
+                        write_manifest_file(p_id, tracks)
+
+                self._library = None
+                with self.batch():
+                    self.set_all_playlists(playlists)
+                    self._commit(
+                        {"op": "set", "key": "storage_backend", "value": backend}
+                    )
 
     def set_all_playlists(self, new_playlists: dict[str, PlaylistData]):
         """Set all playlists"""
-        self._data["playlists"] = new_playlists
-        self._save_config(self._data)
+        with self._lock:
+            if self._library:
+                self._library.replace_all(new_playlists)
+            else:
+                self._commit({"op": "set", "key": "playlists", "value": new_playlists})
+
+            self._load_order()
 
     def set_playlist(self, new_playlist: PlaylistData):
-        """Set a specific playlist value"""
-        if "playlists" not in self._data or self._data["playlists"] is None:
-            self._data["playlists"] = {}
+        """Set a specific playlist value, new playlists go after the rest"""
+        with self._lock:
+            p_id = new_playlist.get("id")
+            if p_id not in self._order:
+                self._order.append(p_id)
+            new_playlist["priority"] = self._order.rank(p_id)
 
-        self._data["playlists"][new_playlist.get("id")] = new_playlist
-        self._save_config(self._data)
+            if self._library:
+                self._library.put(new_playlist)
+                return
 
-    def set_playlist_priority(self, p_id: str, new_priority: int):
-        """Reordena las prioridades desplazando los elementos existentes."""
-        if "playlists" not in self._data or not self._data["playlists"]:
-            return
+            self._commit({"op": "put_playlist", "value": new_playlist})
 
-        playlists = self._data["playlists"]
+    def add_playlist(self, new_playlist: PlaylistData) -> bool:
+        """Add the playlist unless already saved, returns whether it was added"""
+        with self._lock:
+            if self.get_playlist(new_playlist.get("id")) is not None:
+                return False
 
-        ordered_ids = sorted(
-            playlists.keys(), key=lambda k: playlists[k].get("priority", 0)
-        )
+            self.set_playlist(new_playlist)
+            return True
+
+    def remove_playlist(self, p_id: str):
+        """Remove the playlist with given id"""
+        with self._lock:
+            self._order.remove(p_id)
+
+            if self._library:
+                return self._library.delete(p_id)
+
+            if self.get_playlist(p_id) is None:
+                return False
 
-        if p_id in ordered_ids:
-            ordered_ids.remove(p_id)
+            self._commit({"op": "del_playlist", "id": p_id})
+            return True
 
-        new_priority = max(0, min(new_priority, len(ordered_ids)))
-        ordered_ids.insert(new_priority, p_id)
+    def set_playlist_enabled(self, p_id: str, enabled: bool):
+        """Set whether the playlist is synced with the rest"""
+        self._update_playlist(p_id, {"enabled": enabled})
 
-        for index, playlist_id in enumerate(ordered_ids):
-            playlists[playlist_id]["priority"] = index
+    def set_playlist_snapshot(self, p_id: str, snapshot_id: str):
+        """Set the snapshot id the playlist had on its last complete sync"""
+        self._update_playlist(p_id, {"snapshot_id": snapshot_id})
+
+    def set_playlist_sync_interval(self, p_id: str, minutes: int):
+        """Set the minutes between daemon syncs of the playlist, 0 for the default"""
+        self._update_playlist(p_id, {"sync_interval_minutes": max(0, minutes)})
+
+    def _update_playlist(self, p_id: str, fields: dict):
+        if self._library:
+            self._library.update(p_id, fields)
+            return
+
+        with self._lock:
+            if self.get_playlist(p_id) is None:
+                return
+
+            self._commit({"op": "update_playlist", "id": p_id, "fields": fields})
+
+    def set_playlist_priority(self, p_id: str, new_priority: int):
+        """Move the playlist to the given position, only its own rank changes"""
+        with self._lock:
+            if p_id not in self._order:
+                return
+
+            self._write_priorities(self._order.move(p_id, new_priority))
+
+    def reorder_playlists(self, ordered_ids: list[str]):
+        """Apply a whole new order, playlists not listed keep their order after it"""
+        with self._lock:
+            self._write_priorities(
+                self._order.reorder([p_id for p_id in ordered_ids if p_id in self._order])
+            )
+
+    def _write_priorities(self, changed_priorities: dict[str, float]):
+        if not changed_priorities:
+            return
 
-        self._save_config(self._data)
+        if self._library:
+            self._library.set_priorities(changed_priorities)
+        else:
+            self._commit({"op": "priorities", "value": changed_priorities})
+
+
+def _apply_change(data, change: dict):
+    """Apply a journaled change, applying it twice gives the same result"""
+    op = change.get("op")
+
+    if op == "set":
+        data[change["key"]] = change["value"]
+        return
+
+    playlists = data.setdefault("playlists", {})
+
+    if op == "put_playlist":
+        playlists[change["value"]["id"]] = change["value"]
+    elif op == "del_playlist":
+        playlists.pop(change["id"], None)
+    elif op == "update_playlist":
+        playlist = playlists.get(change["id"])
+        if playlist is not None:
+            playlist.update(change["fields"])
+    elif op == "priorities":
+        for p_id, priority in change["value"].items():
+            if p_id in playlists:
+                playlists[p_id]["priority"] = priority
+    else:
+        print(f"Ignoring unknown config change: {change}")
 
 
 CONFIG = ConfigManager()
@@ -0,0 +1,51 @@
+from threading import Lock
+from typing import TYPE_CHECKING
+
+# requests is imported on first use, startup never needs it
+if TYPE_CHECKING:
+    import requests
+
+POOL_SIZE = 16
+REQUEST_TIMEOUT = 15
+
+_session: "requests.Session | None" = None
+_session_lock = Lock()
+
+
+def get_http_session() -> "requests.Session":
+    """Shared keep-alive session, so repeated downloads reuse their connections"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+            _session = requests.Session()
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+
+        return _session
+
+
+def fetch_bytes(url: str | None) -> bytes:
+    """GET the content of the url, empty bytes when it can't be fetched"""
+    if not url:
+        return bytes()
+
+    import requests
+
+    try:
+        response = get_http_session().get(url, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"GET request to {url} failed: {e}")
+        return bytes()
+
+    if response.status_code != 200:
+        print(
+            f"GET request to {url} failed with status code {response.status_code} {response.reason}"
+        )
+        return bytes()
+
+    return response.content or bytes()
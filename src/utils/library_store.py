@@ -0,0 +1,185 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from threading import RLock
+
+LIBRARY_DB_PATH = Path("data.db")
+
+# Columns stored apart from the JSON blob, so they can be indexed
+INDEXED_FIELDS = ("id", "priority", "enabled")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS playlists (
+    id TEXT PRIMARY KEY,
+    priority NUMERIC NOT NULL DEFAULT 0,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_playlists_priority ON playlists (priority);
+CREATE INDEX IF NOT EXISTS idx_playlists_enabled ON playlists (enabled, priority);
+CREATE TABLE IF NOT EXISTS tracks (
+    playlist_id TEXT NOT NULL,
+    track_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    PRIMARY KEY (playlist_id, track_id)
+);
+"""
+
+
+class SqliteLibraryStore:
+    """Playlists and per-track sync state of large libraries, kept in SQLite"""
+
+    def __init__(self, db_path: Path = LIBRARY_DB_PATH):
+        self._lock = RLock()
+        self._batch_depth = 0
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._connection.commit()
+
+    @contextmanager
+    def batch(self):
+        """Commit the changes made inside the block in a single transaction"""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._connection.commit()
+
+    def _commit(self):
+        if self._batch_depth == 0:
+            self._connection.commit()
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    # --- PLAYLISTS ---
+
+    def get_all(self) -> dict:
+        rows = self._query(
+            "SELECT id, priority, enabled, data FROM playlists ORDER BY priority"
+        )
+        return {row[0]: _row_to_playlist(row) for row in rows}
+
+    def get(self, p_id: str) -> dict | None:
+        rows = self._query(
+            "SELECT id, priority, enabled, data FROM playlists WHERE id = ?", (p_id,)
+        )
+        return _row_to_playlist(rows[0]) if rows else None
+
+    def get_enabled(self) -> list:
+        rows = self._query(
+            "SELECT id, priority, enabled, data FROM playlists "
+            "WHERE enabled = 1 ORDER BY priority"
+        )
+        return [_row_to_playlist(row) for row in rows]
+
+    def get_priorities(self) -> list[tuple[str, float]]:
+        """Get the (id, priority) pairs of every playlist ordered by priority"""
+        return [
+            (row[0], row[1])
+            for row in self._query("SELECT id, priority FROM playlists ORDER BY priority")
+        ]
+
+    def put(self, playlist: dict):
+        with self._lock:
+            self._put(playlist)
+            self._commit()
+
+    def _put(self, playlist: dict):
+        data = {k: v for k, v in playlist.items() if k not in INDEXED_FIELDS}
+        self._connection.execute(
+            "INSERT OR REPLACE INTO playlists (id, priority, enabled, data) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                playlist["id"],
+                playlist.get("priority", 0),
+                int(bool(playlist.get("enabled", True))),
+                json.dumps(data),
+            ),
+        )
+
+    def update(self, p_id: str, fields: dict):
+        # Held across the read and the write, or a concurrent update is lost
+        with self._lock:
+            playlist = self.get(p_id)
+            if playlist is None:
+                return
+
+            playlist.update(fields)
+            self.put(playlist)
+
+    def set_priorities(self, priorities: dict[str, float]):
+        with self._lock:
+            self._connection.executemany(
+                "UPDATE playlists SET priority = ? WHERE id = ?",
+                [(priority, p_id) for p_id, priority in priorities.items()],
+            )
+            self._commit()
+
+    def delete(self, p_id: str) -> bool:
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM playlists WHERE id = ?", (p_id,)
+            )
+            self._connection.execute(
+                "DELETE FROM tracks WHERE playlist_id = ?", (p_id,)
+            )
+            self._commit()
+            return cursor.rowcount > 0
+
+    def replace_all(self, playlists: dict):
+        with self._lock:
+            self._connection.execute("DELETE FROM playlists")
+            for playlist in playlists.values():
+                self._put(playlist)
+            self._commit()
+
+    # --- TRACKS ---
+
+    def get_tracks(self, p_id: str) -> dict:
+        rows = self._query(
+            "SELECT track_id, path, size, mtime FROM tracks WHERE playlist_id = ?",
+            (p_id,),
+        )
+        return {
+            row[0]: {"path": row[1], "size": row[2], "mtime": row[3]} for row in rows
+        }
+
+    def set_tracks(self, p_id: str, tracks: dict):
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM tracks WHERE playlist_id = ?", (p_id,)
+            )
+            self._connection.executemany(
+                "INSERT INTO tracks (playlist_id, track_id, path, size, mtime) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (p_id, track_id, entry["path"], entry["size"], entry["mtime"])
+                    for track_id, entry in tracks.items()
+                ],
+            )
+            self._commit()
+
+    def delete_tracks(self, p_id: str):
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM tracks WHERE playlist_id = ?", (p_id,)
+            )
+            self._commit()
+
+
+def _row_to_playlist(row) -> dict:
+    playlist = json.loads(row[3])
+    playlist["id"] = row[0]
+    playlist["priority"] = row[1]
+    playlist["enabled"] = bool(row[2])
+    return playlist
@@ -0,0 +1,101 @@
+from bisect import bisect_left, insort
+
+# Spacing between ranks after a renumbering, leaves room for many moves
+RANK_GAP = 1024.0
+# Below this distance between neighbours the ranks are spread out again
+MIN_RANK_GAP = 1e-6
+
+
+class PriorityOrder:
+    """
+    Playlist ids kept sorted by a fractional rank (the stored priority).
+
+    Moving a playlist gives it a rank between its new neighbours, so only that
+    playlist changes. Ranks are renumbered when neighbours get too close.
+    """
+
+    def __init__(self, ranks: dict[str, float]):
+        self._ranks = dict(ranks)
+        self._keys = sorted((rank, p_id) for p_id, rank in self._ranks.items())
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, p_id: str) -> bool:
+        return p_id in self._ranks
+
+    def ids(self) -> list[str]:
+        return [p_id for _, p_id in self._keys]
+
+    def rank(self, p_id: str) -> float | None:
+        return self._ranks.get(p_id)
+
+    def index_of(self, p_id: str) -> int:
+        rank = self._ranks.get(p_id)
+        if rank is None:
+            return -1
+        return bisect_left(self._keys, (rank, p_id))
+
+    def append(self, p_id: str) -> dict[str, float]:
+        """Place a playlist after every other one"""
+        return self.move(p_id, len(self._keys))
+
+    def remove(self, p_id: str):
+        index = self.index_of(p_id)
+        if index >= 0:
+            del self._keys[index]
+            del self._ranks[p_id]
+
+    def move(self, p_id: str, index: int) -> dict[str, float]:
+        """Move a playlist to the given position, returns the changed ranks"""
+        if self.index_of(p_id) == index:
+            return {}
+
+        self.remove(p_id)
+        index = max(0, min(index, len(self._keys)))
+
+        prev_rank = self._keys[index - 1][0] if index > 0 else None
+        next_rank = self._keys[index][0] if index < len(self._keys) else None
+
+        if prev_rank is None and next_rank is None:
+            rank = 0.0
+        elif prev_rank is None:
+            rank = next_rank - RANK_GAP
+        elif next_rank is None:
+            rank = prev_rank + RANK_GAP
+        else:
+            rank = (prev_rank + next_rank) / 2
+
+        if (prev_rank is not None and rank - prev_rank < MIN_RANK_GAP) or (
+            next_rank is not None and next_rank - rank < MIN_RANK_GAP
+        ):
+            ordered_ids = self.ids()
+            ordered_ids.insert(index, p_id)
+            return self.reorder(ordered_ids)
+
+        self._ranks[p_id] = rank
+        insort(self._keys, (rank, p_id))
+        return {p_id: rank}
+
+    def reorder(self, ordered_ids: list[str]) -> dict[str, float]:
+        """
+        Apply a whole new order at once, returns the changed ranks.
+
+        Known playlists missing from the list keep their relative order after it.
+        """
+        listed = set(ordered_ids)
+        ordered_ids = list(dict.fromkeys(ordered_ids)) + [
+            p_id for p_id in self.ids() if p_id not in listed
+        ]
+
+        changed = {}
+        for index, p_id in enumerate(ordered_ids):
+            rank = index * RANK_GAP
+            if self._ranks.get(p_id) != rank:
+                changed[p_id] = rank
+            self._ranks[p_id] = rank
+
+        self._keys = [
+            (index * RANK_GAP, p_id) for index, p_id in enumerate(ordered_ids)
+        ]
+        return changed
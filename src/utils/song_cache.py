@@ -0,0 +1,118 @@
+import json
+import os
+import time
+from threading import Lock, RLock
+
+SONG_CACHE_PATH = "cache/songs.json"
+
+# Spotify metadata rarely changes, provider matches are the expensive part
+SONG_TTL_SECONDS = 30 * 24 * 60 * 60
+MAX_CACHED_SONGS = 50_000
+
+
+class SongCache:
+    """Resolved spotdl songs (metadata and provider match) keyed by Spotify track id"""
+
+    def __init__(
+        self,
+        cache_path: str = SONG_CACHE_PATH,
+        ttl: float = SONG_TTL_SECONDS,
+        max_songs: int = MAX_CACHED_SONGS,
+    ):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.max_songs = max_songs
+        self._lock = RLock()
+        # Writes the file, held apart so saving never blocks get and put
+        self._save_lock = Lock()
+        self._entries: dict[str, dict] | None = None
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                    self._entries = data if isinstance(data, dict) else {}
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, track_id: str) -> dict | None:
+        """Get the song data of a track, None if missing or expired"""
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(track_id)
+            if entry is None:
+                return None
+
+            now = time.time()
+            if now - entry["saved_at"] > self.ttl:
+                del entries[track_id]
+                self._dirty = True
+                return None
+
+            # Recency is written along with the next real change, a read
+            # alone isn't worth rewriting the whole file
+            entry["used_at"] = now
+            return entry["song"]
+
+    def put(self, track_id: str, song_data: dict):
+        with self._lock:
+            now = time.time()
+            self._load()[track_id] = {
+                "song": song_data,
+                "saved_at": now,
+                "used_at": now,
+            }
+            self._dirty = True
+
+    def forget_match(self, track_id: str):
+        """Drop the provider match of a track after it failed to download"""
+        with self._lock:
+            entry = self._load().get(track_id)
+            if entry and entry["song"].get("download_url"):
+                entry["song"]["download_url"] = None
+                self._dirty = True
+
+    def save(self):
+        """Write the cache if it changed, meant to run once per sync run"""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty or self._entries is None:
+                    return
+
+                self._evict()
+                entries = dict(self._entries)
+                self._dirty = False
+
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                print(f"Error saving song cache {self.cache_path}: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    def _evict(self):
+        entries = self._entries
+        if entries is None:
+            return
+
+        now = time.time()
+        for track_id in [
+            t_id for t_id, entry in entries.items() if now - entry["saved_at"] > self.ttl
+        ]:
+            del entries[track_id]
+
+        overflow = len(entries) - self.max_songs
+        if overflow > 0:
+            least_used = sorted(entries, key=lambda t_id: entries[t_id]["used_at"])
+            for track_id in least_used[:overflow]:
+                del entries[track_id]
+
+
+SONG_CACHE = SongCache()
@@ -0,0 +1,221 @@
+import json
+import time
+from concurrent.futures import Future
+from threading import Lock
+from typing import Callable
+from urllib.parse import urlparse
+
+# Sustained requests per second and the burst allowed on top of it
+REQUESTS_PER_SECOND = 10
+BURST_SIZE = 20
+# 429 responses are retried this many times after waiting their Retry-After
+MAX_RATE_LIMIT_RETRIES = 4
+# Used when a 429 comes without a Retry-After header
+DEFAULT_RETRY_AFTER = 5
+# Longer waits are not sat through, the call fails once the pause is set
+MAX_RETRY_AFTER = 300
+
+# Path segments followed by an id, collapsed so the counters group by endpoint
+ID_SEGMENTS = {"albums", "artists", "episodes", "playlists", "shows", "tracks", "users"}
+
+
+class EndpointStats:
+    """Call counters and latency of one API endpoint"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.coalesced = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_seconds * 1000 / self.calls if self.calls else 0.0
+
+
+class SpotifyApiLimiter:
+    """
+    Shared gate for every Spotify Web API call, spotipy's and spotdl's alike.
+
+    Calls are throttled by a token bucket, a 429 pauses every caller for its
+    Retry-After instead of only the one that got it, identical GET requests in
+    flight are sent once, and latency is counted per endpoint.
+    """
+
+    def __init__(self, rate: float = REQUESTS_PER_SECOND, burst: int = BURST_SIZE):
+        self.rate = rate
+        self.burst = burst
+        self._lock = Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight: dict[tuple, Future] = {}
+        self._stats: dict[str, EndpointStats] = {}
+
+    def install(self, client):
+        """Route the API calls of a spotipy client (or subclass) through the gate"""
+        if getattr(client, "_api_limiter_installed", False):
+            return
+
+        # urllib3 would otherwise retry 429s on its own, per thread and unthrottled
+        status_forcelist = getattr(client, "status_forcelist", None)
+        if status_forcelist and 429 in status_forcelist and hasattr(
+            client, "_build_session"
+        ):
+            client.status_forcelist = tuple(s for s in status_forcelist if s != 429)
+            client._build_session()
+
+        internal_call = client._internal_call
+
+        def limited_call(method, url, payload, params):
+            return self.call(internal_call, method, url, payload, params)
+
+        client._internal_call = limited_call
+        client._api_limiter_installed = True
+
+    def call(self, fn: Callable, method: str, url: str, payload, params):
+        """Send fn(method, url, payload, params) through the gate"""
+        endpoint = _endpoint_of(method, url)
+
+        if method != "GET":
+            return self._send(fn, endpoint, method, url, payload, params)
+
+        key = (url, json.dumps(params, sort_keys=True, default=str))
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self._get_stats(endpoint).coalesced += 1
+
+        # Callers of an identical request share the response of the first one
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = self._send(fn, endpoint, method, url, payload, params)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _send(self, fn: Callable, endpoint: str, method, url, payload, params):
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self._acquire()
+
+            start = time.perf_counter()
+            try:
+                result = fn(method, url, payload, params)
+            except Exception as e:
+                retry_after = _retry_after_of(e)
+                self._record(endpoint, start, failed=True, rate_limited=retry_after)
+                if retry_after is None:
+                    raise
+
+                self._pause(retry_after)
+                if attempt == MAX_RATE_LIMIT_RETRIES or retry_after > MAX_RETRY_AFTER:
+                    raise
+
+                print(f"Rate limited on {endpoint}, retrying in {retry_after:.0f}s")
+                continue
+
+            self._record(endpoint, start)
+            return result
+
+    def _acquire(self):
+        """Wait for a pause to end and a token to be available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait_seconds = self._paused_until - now
+
+                if wait_seconds <= 0:
+                    self._tokens = min(
+                        self.burst, self._tokens + (now - self._last_refill) * self.rate
+                    )
+                    self._last_refill = now
+
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+
+                    wait_seconds = (1 - self._tokens) / self.rate
+
+            time.sleep(wait_seconds)
+
+    def _pause(self, seconds: float):
+        with self._lock:
+            until = time.monotonic() + min(seconds, MAX_RETRY_AFTER)
+            self._paused_until = max(self._paused_until, until)
+            # Nothing is sent while paused, the bucket shouldn't burst right after
+            self._tokens = 0
+            self._last_refill = until
+
+    def _get_stats(self, endpoint: str) -> EndpointStats:
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = self._stats[endpoint] = EndpointStats()
+        return stats
+
+    def _record(
+        self,
+        endpoint: str,
+        start: float,
+        failed: bool = False,
+        rate_limited: float | None = None,
+    ):
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            stats = self._get_stats(endpoint)
+            stats.calls += 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            if failed:
+                stats.errors += 1
+            if rate_limited is not None:
+                stats.rate_limited += 1
+
+    def get_stats(self) -> dict[str, EndpointStats]:
+        """Counters of every endpoint called so far"""
+        with self._lock:
+            return dict(self._stats)
+
+    def print_stats(self):
+        for endpoint, stats in sorted(self.get_stats().items()):
+            print(
+                f"{endpoint}: {stats.calls} calls, {stats.average_ms:.0f} ms avg, "
+                f"{stats.max_seconds * 1000:.0f} ms max, {stats.errors} errors, "
+                f"{stats.rate_limited} rate limited, {stats.coalesced} coalesced"
+            )
+
+
+def _endpoint_of(method: str, url: str) -> str:
+    segments = [s for s in urlparse(url).path.split("/") if s and s != "v1"]
+    for i in range(1, len(segments)):
+        if segments[i - 1] in ID_SEGMENTS:
+            segments[i] = "{id}"
+    return f"{method} /{'/'.join(segments)}"
+
+
+def _retry_after_of(error: Exception) -> float | None:
+    """Seconds to wait before retrying, None when the error isn't a rate limit"""
+    if getattr(error, "http_status", None) != 429:
+        return None
+
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After", DEFAULT_RETRY_AFTER)))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+SPOTIFY_API = SpotifyApiLimiter()
@@ -0,0 +1,132 @@
+import json
+import mmap
+import os
+import secrets
+from PySide6.QtGui import QImage, QPixmap
+from src.utils.cache_manager import THUMBNAIL_SIZE
+from src.utils.thumbnail_cache import THUMBNAILS
+
+SNAPSHOT_PATH = "cache/startup.json"
+ATLAS_PATH = "cache/startup.atlas"
+SNAPSHOT_VERSION = 1
+
+# Only the rows visible on the first frame get their thumbnail in the atlas,
+# every other cover is decoded from the pack when scrolled into view
+ATLAS_ROWS = 32
+ATLAS_FORMAT = QImage.Format.Format_ARGB32_Premultiplied
+# Random header shared by an atlas and the snapshot pointing into it
+ATLAS_TOKEN_BYTES = 16
+
+
+class StartupSnapshot:
+    """
+    The manage view as it was on exit: the ordered playlist rows and an atlas of
+    already decoded thumbnails, so the next start can paint without decoding.
+    """
+
+    def __init__(
+        self, rows: list[dict], atlas_slots: dict[str, int], atlas_token: str
+    ):
+        self.rows = rows
+        self.atlas_slots = atlas_slots
+        self.atlas_token = atlas_token
+
+    @classmethod
+    def load(cls) -> "StartupSnapshot | None":
+        try:
+            with open(SNAPSHOT_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != SNAPSHOT_VERSION
+            or data.get("thumbnail_size") != THUMBNAIL_SIZE
+        ):
+            return None
+
+        return cls(
+            data.get("rows", []),
+            data.get("atlas_slots", {}),
+            data.get("atlas_token", ""),
+        )
+
+    def load_thumbnails(self):
+        """Put the atlas thumbnails in the shared cache, ready for the first paint"""
+        if not self.atlas_slots:
+            return
+
+        slot_bytes = _slot_bytes()
+        try:
+            with open(ATLAS_PATH, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as atlas:
+                    # An atlas written for another snapshot would show wrong covers
+                    if atlas[:ATLAS_TOKEN_BYTES].decode("ascii") != self.atlas_token:
+                        return
+
+                    for p_id, slot in self.atlas_slots.items():
+                        offset = ATLAS_TOKEN_BYTES + slot * slot_bytes
+                        if offset + slot_bytes > len(atlas):
+                            continue
+
+                        image = QImage(
+                            atlas[offset : offset + slot_bytes],
+                            THUMBNAIL_SIZE,
+                            THUMBNAIL_SIZE,
+                            THUMBNAIL_SIZE * 4,
+                            ATLAS_FORMAT,
+                        )
+                        # fromImage copies the pixels, the slice can be released
+                        THUMBNAILS.put(p_id, QPixmap.fromImage(image))
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            print(f"Unable to read startup atlas {ATLAS_PATH}: {e}")
+
+
+def save_startup_snapshot(rows: list[dict]):
+    """Write the ordered rows and the thumbnails of the first ones"""
+    os.makedirs(os.path.dirname(SNAPSHOT_PATH), exist_ok=True)
+
+    atlas_slots = {}
+    atlas_token = secrets.token_hex(ATLAS_TOKEN_BYTES // 2)
+    atlas_tmp_path = f"{ATLAS_PATH}.tmp"
+    snapshot_tmp_path = f"{SNAPSHOT_PATH}.tmp"
+
+    try:
+        with open(atlas_tmp_path, "wb") as f:
+            f.write(atlas_token.encode("ascii"))
+            for playlist in rows[:ATLAS_ROWS]:
+                p_id = playlist.get("id")
+                pixmap = THUMBNAILS.get(p_id, None, THUMBNAIL_SIZE)
+                if pixmap.isNull():
+                    continue
+
+                image = pixmap.toImage().convertToFormat(ATLAS_FORMAT)
+                if image.width() != THUMBNAIL_SIZE or image.height() != THUMBNAIL_SIZE:
+                    continue
+
+                # Rows of a QImage are padded to 4 bytes, ARGB32 rows never are
+                atlas_slots[p_id] = len(atlas_slots)
+                f.write(bytes(image.constBits()))
+
+        # Should the snapshot below not be replaced, the token won't match
+        os.replace(atlas_tmp_path, ATLAS_PATH)
+
+        with open(snapshot_tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": SNAPSHOT_VERSION,
+                    "thumbnail_size": THUMBNAIL_SIZE,
+                    "rows": rows,
+                    "atlas_slots": atlas_slots,
+                    "atlas_token": atlas_token,
+                },
+                f,
+            )
+        os.replace(snapshot_tmp_path, SNAPSHOT_PATH)
+    except OSError as e:
+        print(f"Error saving startup snapshot {SNAPSHOT_PATH}: {e}")
+
+
+def _slot_bytes() -> int:
+    return THUMBNAIL_SIZE * THUMBNAIL_SIZE * 4
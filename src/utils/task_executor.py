@@ -0,0 +1,143 @@
+import heapq
+import itertools
+from enum import IntEnum
+from threading import Condition, Event, Thread
+from typing import Callable
+
+TASK_WORKERS = 4
+# Syncs take minutes, they get their own workers so short interactive tasks
+# like searching or adding a playlist never wait behind them
+SYNC_WORKERS = 4
+
+
+class TaskPriority(IntEnum):
+    """Queued tasks start lowest value first, in submission order among equals"""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class TaskHandle:
+    """Returned for every submitted task, to follow or cancel it"""
+
+    def __init__(
+        self, name: str, priority: TaskPriority, on_cancel: Callable | None = None
+    ):
+        self.name = name
+        self.priority = priority
+        self.cancel_event = Event()
+        self._on_cancel = on_cancel
+        self._started = False
+        self._done = Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def cancel(self):
+        """Drop the task if still queued, otherwise ask it to stop"""
+        if self.done or self.cancelled:
+            return
+
+        self.cancel_event.set()
+        if self._started and self._on_cancel:
+            self._on_cancel()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+
+class TaskExecutor:
+    """
+    A bounded set of worker threads shared by every background operation.
+
+    Tasks are queued by priority rather than rejected while others run, and
+    workers are only started when no idle one can take the task.
+    """
+
+    def __init__(self, max_workers: int = TASK_WORKERS, name: str = "task"):
+        self.max_workers = max_workers
+        self.name = name
+        self._condition = Condition()
+        self._queue: list = []
+        self._counter = itertools.count()
+        self._workers: list[Thread] = []
+        self._idle_workers = 0
+
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        name: str = "",
+        priority: TaskPriority = TaskPriority.NORMAL,
+        on_cancel: Callable | None = None,
+        on_skipped: Callable | None = None,
+    ) -> TaskHandle:
+        """
+        Queue fn(*args) and return its handle.
+
+        on_cancel runs when a started task is cancelled and should make it stop,
+        on_skipped runs instead of fn for tasks cancelled while still queued.
+        """
+        name = name or getattr(fn, "__qualname__", "")
+        handle = TaskHandle(name, priority, on_cancel)
+
+        with self._condition:
+            heapq.heappush(
+                self._queue,
+                (priority, next(self._counter), handle, fn, args, on_skipped),
+            )
+
+            # Idle workers only leave the count once they wake up, so compare
+            # against everything still queued rather than this task alone
+            if (
+                len(self._queue) > self._idle_workers
+                and len(self._workers) < self.max_workers
+            ):
+                worker = Thread(
+                    target=self._work,
+                    name=f"{self.name}-worker-{len(self._workers)}",
+                    daemon=True,
+                )
+                self._workers.append(worker)
+                worker.start()
+
+            self._condition.notify()
+
+        return handle
+
+    def _work(self):
+        while True:
+            with self._condition:
+                self._idle_workers += 1
+                while not self._queue:
+                    self._condition.wait()
+                self._idle_workers -= 1
+
+                _, _, handle, fn, args, on_skipped = heapq.heappop(self._queue)
+
+            try:
+                if handle.cancelled:
+                    if on_skipped:
+                        on_skipped()
+                    continue
+
+                handle._started = True
+                fn(*args)
+            except Exception as e:
+                print(f"An unexpected error occurred in task '{handle.name}': {e}")
+            finally:
+                handle._done.set()
+
+
+TASKS = TaskExecutor()
+SYNC_TASKS = TaskExecutor(SYNC_WORKERS, name="sync")
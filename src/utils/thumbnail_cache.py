@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from PySide6 import QtCore
+from PySide6.QtGui import QImage, QPixmap
+from src.utils.cache_manager import CACHE
+
+MAX_THUMBNAIL_BYTES = 64 * 1024 * 1024
+DECODE_WORKERS = 4
+
+
+class ThumbnailCache:
+    """Decoded cover thumbnails shared by every card, evicting the least recently used"""
+
+    def __init__(self, max_bytes: int = MAX_THUMBNAIL_BYTES):
+        self.max_bytes = max_bytes
+        self._pixmaps: OrderedDict[str, QPixmap] = OrderedDict()
+        self._size = 0
+        # Filled from the startup atlas and by decoded covers, read while painting
+        self._lock = Lock()
+
+    def peek(self, p_id: str) -> QPixmap | None:
+        """Get the thumbnail of a playlist only if it is already decoded"""
+        with self._lock:
+            pixmap = self._pixmaps.get(p_id)
+            if pixmap is not None:
+                self._pixmaps.move_to_end(p_id)
+            return pixmap
+
+    def get(self, p_id: str, cover_bytes: bytes | None, size: int) -> QPixmap:
+        """Get the thumbnail of a playlist, decoding the given or cached cover if needed"""
+        pixmap = self.peek(p_id)
+        if pixmap is not None:
+            return pixmap
+
+        if not cover_bytes:
+            cover_bytes = CACHE.get_cover(p_id)
+
+        image = decode_thumbnail(cover_bytes, size)
+        if image.isNull():
+            return QPixmap()
+
+        pixmap = QPixmap.fromImage(image)
+        self.put(p_id, pixmap)
+        return pixmap
+
+    def put(self, p_id: str, pixmap: QPixmap):
+        with self._lock:
+            self._discard(p_id)
+            self._pixmaps[p_id] = pixmap
+            self._size += _pixmap_bytes(pixmap)
+
+            while self._size > self.max_bytes and len(self._pixmaps) > 1:
+                _, evicted = self._pixmaps.popitem(last=False)
+                self._size -= _pixmap_bytes(evicted)
+
+    def discard(self, p_id: str):
+        with self._lock:
+            self._discard(p_id)
+
+    def _discard(self, p_id: str):
+        pixmap = self._pixmaps.pop(p_id, None)
+        if pixmap is not None:
+            self._size -= _pixmap_bytes(pixmap)
+
+
+def _pixmap_bytes(pixmap: QPixmap) -> int:
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class CoverDecoder(QtCore.QObject):
+    """
+    Decodes covers into thumbnails on a thread pool.
+
+    Only QImage can be used off the GUI thread, the pixmap is made once the
+    image is back on it and `ready` tells views to repaint that playlist.
+    """
+
+    ready = QtCore.Signal(str)
+    _decoded = QtCore.Signal(str, QImage)
+
+    def __init__(self, workers: int = DECODE_WORKERS):
+        super().__init__()
+        self.workers = workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+        self._pending: set[str] = set()
+        # Playlists without a decodable cover, retried only when given new bytes
+        self._failed: set[str] = set()
+
+        self._decoded.connect(
+            self._on_decoded, QtCore.Qt.ConnectionType.QueuedConnection
+        )
+
+    def request(
+        self, p_id: str, cover_bytes: bytes | None, size: int, force: bool = False
+    ):
+        """Queue the decoding of a cover, force it when its bytes just changed"""
+        with self._lock:
+            if not force and (p_id in self._pending or p_id in self._failed):
+                return
+            self._pending.add(p_id)
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="cover-decode"
+                )
+
+        self._executor.submit(self._decode, p_id, cover_bytes, size)
+
+    def _decode(self, p_id: str, cover_bytes: bytes | None, size: int):
+        try:
+            if not cover_bytes:
+                cover_bytes = CACHE.get_cover(p_id)
+            image = decode_thumbnail(cover_bytes, size)
+        except Exception as e:
+            print(f"Error decoding cover of playlist {p_id}: {e}")
+            image = QImage()
+
+        self._decoded.emit(p_id, image)
+
+    @QtCore.Slot(str, QImage)
+    def _on_decoded(self, p_id: str, image: QImage):
+        with self._lock:
+            self._pending.discard(p_id)
+            if image.isNull():
+                self._failed.add(p_id)
+                return
+            self._failed.discard(p_id)
+
+        THUMBNAILS.put(p_id, QPixmap.fromImage(image))
+        self.ready.emit(p_id)
+
+
+def decode_thumbnail(cover_bytes: bytes | None, size: int) -> QImage:
+    """Decode and scale a cover, safe to call from any thread"""
+    if not cover_bytes:
+        return QImage()
+
+    image = QImage.fromData(cover_bytes)
+    if image.isNull():
+        return image
+
+    return image.scaled(
+        size,
+        size,
+        QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+        QtCore.Qt.TransformationMode.SmoothTransformation,
+    ).convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+
+
+THUMBNAILS = ThumbnailCache()
+COVER_DECODER = CoverDecoder()
@@ -0,0 +1,77 @@
+from rapidfuzz import fuzz, process
+from unidecode import unidecode
+
+# Shorter queries only match as substrings, fuzzy matching them is mostly noise
+MIN_FUZZY_QUERY_LENGTH = 3
+MIN_FUZZY_SCORE = 75
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase ASCII transliteration with collapsed whitespace"""
+    return " ".join(unidecode(title or "").lower().split())
+
+
+class TitleIndex:
+    """Normalized playlist titles, computed once so filtering only does matching"""
+
+    def __init__(self):
+        self._titles: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def add(self, p_id: str, title: str):
+        self._titles[p_id] = normalize_title(title)
+
+    def remove(self, p_id: str):
+        self._titles.pop(p_id, None)
+
+    def clear(self):
+        self._titles.clear()
+
+    def matches(self, p_id: str, query: str) -> bool:
+        """Check a single playlist, for rows added while a filter is active"""
+        title = self._titles.get(p_id)
+        if title is None:
+            return False
+        return _score(title, normalize_title(query)) is not None
+
+    def search(self, query: str) -> dict[str, float]:
+        """
+        Score every playlist against the query, best matches first.
+
+        Returns id -> score for the matching playlists only, an empty query
+        matches everything with the same score.
+        """
+        query = normalize_title(query)
+        if not query:
+            return dict.fromkeys(self._titles, 100.0)
+
+        # Substring hits always rank first and don't need a fuzzy pass
+        scores = {
+            p_id: 100.0 for p_id, title in self._titles.items() if query in title
+        }
+
+        if len(query) >= MIN_FUZZY_QUERY_LENGTH:
+            fuzzy_matches = process.extract(
+                query,
+                {p_id: t for p_id, t in self._titles.items() if p_id not in scores},
+                scorer=fuzz.partial_ratio,
+                processor=None,
+                score_cutoff=MIN_FUZZY_SCORE,
+                limit=None,
+            )
+            for _, score, p_id in sorted(fuzzy_matches, key=lambda m: -m[1]):
+                scores[p_id] = score
+
+        return scores
+
+
+def _score(title: str, query: str) -> float | None:
+    if not query or query in title:
+        return 100.0
+    if len(query) < MIN_FUZZY_QUERY_LENGTH:
+        return None
+
+    score = fuzz.partial_ratio(query, title, score_cutoff=MIN_FUZZY_SCORE)
+    return score or None
@@ -0,0 +1,118 @@
+import json
+import os
+from typing import Iterable, TypedDict
+from src.utils.config_manager import CONFIG
+
+MANIFEST_DIR = "cache/manifests"
+
+
+class TrackEntry(TypedDict):
+    path: str
+    size: int
+    mtime: float
+
+
+class TrackManifest:
+    """Spotify track id -> local file of an already synced playlist"""
+
+    def __init__(self, p_id: str):
+        self.p_id = p_id
+        self.manifest_path = os.path.join(MANIFEST_DIR, f"{p_id}.json")
+        self.tracks: dict[str, TrackEntry] = self._load()
+        self._dirty = False
+
+    def _load(self) -> dict[str, TrackEntry]:
+        library = CONFIG.get_library_store()
+        if library:
+            tracks = library.get_tracks(self.p_id)
+            if tracks:
+                return tracks
+
+        # Manifests written before the SQLite backend was enabled are still read
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        if not self._dirty:
+            return
+
+        library = CONFIG.get_library_store()
+        if library:
+            library.set_tracks(self.p_id, self.tracks)
+            self._dirty = False
+            _delete_manifest_file(self.p_id)
+            return
+
+        if write_manifest_file(self.p_id, self.tracks):
+            self._dirty = False
+
+    def is_synced(self, track_id: str) -> bool:
+        """Check that the track was downloaded and its file is still untouched"""
+        entry = self.tracks.get(track_id)
+        if not entry:
+            return False
+
+        try:
+            stat = os.stat(entry["path"])
+        except OSError:
+            return False
+
+        return stat.st_size == entry["size"] and stat.st_mtime == entry["mtime"]
+
+    def record(self, track_id: str, file_path: str):
+        try:
+            stat = os.stat(file_path)
+        except OSError as e:
+            print(f"Unable to record track {track_id} in manifest: {e}")
+            return
+
+        self.tracks[track_id] = {
+            "path": os.path.abspath(file_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+        }
+        self._dirty = True
+
+    def prune(self, current_track_ids: Iterable[str]):
+        """Drop entries of tracks that are no longer part of the playlist"""
+        current = set(current_track_ids)
+        for track_id in list(self.tracks):
+            if track_id not in current:
+                del self.tracks[track_id]
+                self._dirty = True
+
+
+def delete_manifest(p_id: str):
+    library = CONFIG.get_library_store()
+    if library:
+        library.delete_tracks(p_id)
+
+    _delete_manifest_file(p_id)
+
+
+def write_manifest_file(p_id: str, tracks: dict[str, TrackEntry]) -> bool:
+    """Write the tracks of a playlist to its JSON manifest"""
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    manifest_path = os.path.join(MANIFEST_DIR, f"{p_id}.json")
+    tmp_path = f"{manifest_path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(tracks, f)
+        os.replace(tmp_path, manifest_path)
+        return True
+    except OSError as e:
+        print(f"Error saving track manifest {manifest_path}: {e}")
+        return False
+
+
+def _delete_manifest_file(p_id: str):
+    manifest_path = os.path.join(MANIFEST_DIR, f"{p_id}.json")
+    try:
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+    except OSError as e:
+        print(f"Error deleting manifest file {manifest_path}: {e}")
@@ -0,0 +1,80 @@
+import os
+import shutil
+import sys
+from collections import defaultdict
+from pathlib import Path
+from threading import Lock
+
+STORE_DIR_NAME = ".library"
+
+# Linux ioctl to clone a file sharing its extents (btrfs, xfs...)
+FICLONE = 0x40049409
+
+_track_locks: defaultdict[str, Lock] = defaultdict(Lock)
+_track_locks_guard = Lock()
+
+
+def get_store_dir(playlists_path: str) -> Path:
+    """Shared store lives next to the playlists so hardlinks stay on one filesystem"""
+    store_dir = Path(playlists_path) / STORE_DIR_NAME
+    store_dir.mkdir(parents=True, exist_ok=True)
+    return store_dir
+
+
+def get_track_lock(track_id: str) -> Lock:
+    """Lock held while a track is fetched, so playlists sharing it download it once"""
+    with _track_locks_guard:
+        return _track_locks[track_id]
+
+
+def find_stored_track(store_dir: Path, track_id: str) -> Path | None:
+    for path in store_dir.glob(f"{track_id}.*"):
+        if path.is_file():
+            return path
+    return None
+
+
+def link_track(source: Path, target: Path) -> Path | None:
+    """Expose a stored track inside a playlist folder without duplicating its data"""
+    if target.exists():
+        return target
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        os.link(source, target)
+        return target
+    except OSError:
+        pass
+
+    if _reflink(source, target):
+        return target
+
+    try:
+        os.symlink(source.resolve(), target)
+        return target
+    except OSError:
+        pass
+
+    try:
+        shutil.copy2(source, target)
+        return target
+    except OSError as e:
+        print(f"Unable to link track {source} into {target}: {e}")
+        return None
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+
+    import fcntl
+
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        if target.exists():
+            target.unlink()
+        return False
@@ -0,0 +1,16 @@
+import os
+import shutil
+import tempfile
+
+_previous_cwd = os.getcwd()
+_work_dir = tempfile.mkdtemp(prefix="spotmanager-tests-")
+
+
+def pytest_sessionstart(session):
+    # The config and caches create their files in the working directory on import
+    os.chdir(_work_dir)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    os.chdir(_previous_cwd)
+    shutil.rmtree(_work_dir, ignore_errors=True)
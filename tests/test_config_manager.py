@@ -0,0 +1,76 @@
+import json
+import pytest
+from src.utils import config_manager
+from src.utils.config_manager import ConfigManager
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_manager, "CONFIG_FILE_PATH", tmp_path / "data.json")
+    monkeypatch.setattr(config_manager, "JOURNAL_FILE_PATH", tmp_path / "data.journal")
+    return tmp_path
+
+
+def _playlist(p_id: str, priority: float = 0) -> dict:
+    return {"id": p_id, "title": p_id, "priority": priority, "enabled": True}
+
+
+def _write_snapshot(data_dir, playlists: list[dict]):
+    data = {"playlists": {playlist["id"]: playlist for playlist in playlists}}
+    (data_dir / "data.json").write_text(json.dumps(data))
+
+
+def _ids(manager: ConfigManager) -> list[str]:
+    return [playlist["id"] for playlist in manager.get_ordered_playlists()]
+
+
+def test_reorder_playlists_keeps_unlisted_ones_after(data_dir):
+    _write_snapshot(data_dir, [_playlist(p_id, i) for i, p_id in enumerate("abcd")])
+    manager = ConfigManager()
+
+    manager.reorder_playlists(["c", "missing", "a"])
+    manager.flush()
+
+    assert _ids(manager) == ["c", "a", "b", "d"]
+    assert _ids(ConfigManager()) == ["c", "a", "b", "d"]
+
+
+def test_journal_is_replayed_over_the_snapshot(data_dir):
+    _write_snapshot(data_dir, [_playlist("a"), _playlist("b", 1)])
+    manager = ConfigManager()
+
+    manager.set_username("someone")
+    manager.set_playlist_enabled("a", False)
+    manager.remove_playlist("b")
+    manager.flush()
+
+    snapshot = json.loads((data_dir / "data.json").read_text())
+    assert snapshot.get("username") != "someone"
+    assert "b" in snapshot["playlists"]
+
+    reloaded = ConfigManager()
+    assert reloaded.get_username() == "someone"
+    assert reloaded.get_playlist("a")["enabled"] is False
+    assert reloaded.get_playlist("b") is None
+
+
+def test_torn_journal_tail_is_dropped_and_compacted(data_dir):
+    _write_snapshot(data_dir, [_playlist("a")])
+    changes = [
+        {"op": "set", "key": "username", "value": "someone"},
+        {"op": "update_playlist", "id": "a", "fields": {"title": "renamed"}},
+    ]
+    with open(data_dir / "data.journal", "w", encoding="utf-8") as f:
+        f.write("".join(f"{json.dumps(change)}\n" for change in changes))
+        # A crash in the middle of an append leaves a partial line
+        f.write('{"op": "set", "key": "username", "val')
+
+    manager = ConfigManager()
+
+    assert manager.get_username() == "someone"
+    assert manager.get_playlist("a")["title"] == "renamed"
+    assert (data_dir / "data.journal").read_text() == ""
+
+    snapshot = json.loads((data_dir / "data.json").read_text())
+    assert snapshot["username"] == "someone"
+    assert snapshot["playlists"]["a"]["title"] == "renamed"
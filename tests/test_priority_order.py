@@ -0,0 +1,27 @@
+from src.utils.priority_order import RANK_GAP, PriorityOrder
+
+
+def test_move_between_spread_ranks_changes_only_the_moved_playlist():
+    order = PriorityOrder({"a": 0.0, "b": RANK_GAP, "c": 2 * RANK_GAP})
+
+    changed = order.move("c", 1)
+
+    assert order.ids() == ["a", "c", "b"]
+    assert changed == {"c": RANK_GAP / 2}
+
+
+def test_tied_legacy_priorities_are_renumbered_on_move():
+    # Older configs could save several playlists with the same priority
+    order = PriorityOrder({"a": 0, "b": 0, "c": 0, "d": 1})
+
+    changed = order.move("d", 1)
+
+    assert order.ids() == ["a", "d", "b", "c"]
+    ranks = [order.rank(p_id) for p_id in order.ids()]
+    assert ranks == sorted(set(ranks))
+    assert changed == {p_id: order.rank(p_id) for p_id in changed}
+    assert set(changed) == {"b", "c", "d"}
+
+    # Once spread out, the next move touches a single playlist again
+    assert order.move("a", 3) == {"a": order.rank("a")}
+    assert order.ids() == ["d", "b", "c", "a"]
@@ -0,0 +1,74 @@
+import threading
+import time
+from src.utils.spotify_api import SpotifyApiLimiter
+
+URL = "https://api.spotify.com/v1/playlists/abc/tracks"
+
+
+class RateLimited(Exception):
+    http_status = 429
+
+    def __init__(self, retry_after: str):
+        super().__init__("rate limited")
+        self.headers = {"Retry-After": retry_after}
+
+
+def test_retry_after_pauses_every_caller():
+    limiter = SpotifyApiLimiter()
+    sent_at = []
+
+    def fn(method, url, payload, params):
+        sent_at.append(time.monotonic())
+        if len(sent_at) == 1:
+            raise RateLimited("0.3")
+        return url
+
+    start = time.monotonic()
+    leader = threading.Thread(target=limiter.call, args=(fn, "GET", URL, None, None))
+    leader.start()
+    while not limiter._paused_until and leader.is_alive():
+        time.sleep(0.01)
+
+    # A different request made during the pause waits for it as well
+    assert limiter.call(fn, "GET", URL + "?offset=100", None, None).endswith("100")
+    leader.join(2)
+
+    assert len(sent_at) == 3
+    assert all(at - start >= 0.3 for at in sent_at[1:])
+
+    stats = limiter.get_stats()["GET /playlists/{id}/tracks"]
+    assert stats.calls == 3
+    assert stats.rate_limited == 1
+
+
+def test_identical_gets_in_flight_are_sent_once():
+    limiter = SpotifyApiLimiter()
+    release = threading.Event()
+    calls = []
+
+    def fn(method, url, payload, params):
+        calls.append(params)
+        release.wait(2)
+        return {"items": []}
+
+    results = []
+
+    def call():
+        results.append(limiter.call(fn, "GET", URL, None, {"limit": 100}))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(calls) == 1
+    assert len(results) == 3
+    assert all(result is results[0] for result in results)
+    assert limiter.get_stats()["GET /playlists/{id}/tracks"].coalesced == 2
+
+    # Once the first request is done, the same one is sent again
+    limiter.call(fn, "GET", URL, None, {"limit": 100})
+    assert len(calls) == 2
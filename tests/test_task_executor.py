@@ -0,0 +1,28 @@
+import threading
+import time
+from src.utils.task_executor import TaskExecutor
+
+
+def test_pool_grows_while_a_worker_is_idle():
+    executor = TaskExecutor(max_workers=4)
+
+    # Leave a single worker started and idle
+    executor.submit(lambda: None).wait(1)
+    time.sleep(0.05)
+    assert len(executor._workers) == 1
+
+    threads = set()
+    release = threading.Event()
+
+    def task():
+        threads.add(threading.current_thread().name)
+        release.wait(1)
+
+    handles = [executor.submit(task) for _ in range(3)]
+    time.sleep(0.2)
+    release.set()
+    for handle in handles:
+        assert handle.wait(2)
+
+    assert len(threads) == 3
+    assert len(executor._workers) == 3
@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("rapidfuzz")
+pytest.importorskip("unidecode")
+
+from src.utils.title_index import TitleIndex  # noqa: E402
+
+
+@pytest.fixture
+def index():
+    index = TitleIndex()
+    index.add("summer", "Summer Hits 2024")
+    index.add("summertime", "Summertime  Sadness")
+    index.add("samba", "Sumer Samba")
+    index.add("cafe", "Café del Mar")
+    index.add("rock", "Classic Rock")
+    return index
+
+
+def test_substring_hits_rank_before_fuzzy_ones(index):
+    scores = index.search("summer")
+
+    assert list(scores)[:2] == ["summer", "summertime"]
+    assert scores["summer"] == scores["summertime"] == 100.0
+    assert list(scores)[2] == "samba"
+    assert scores["samba"] < 100.0
+    assert "rock" not in scores
+
+
+def test_titles_are_matched_without_accents_or_case(index):
+    assert list(index.search("CAFE DEL")) == ["cafe"]
+    assert index.matches("cafe", "café")
+
+
+def test_short_queries_only_match_substrings(index):
+    assert index.search("zq") == {}
+    assert set(index.search("ro")) == {"rock"}
+
+
+def test_empty_query_matches_everything(index):
+    assert index.search("  ") == dict.fromkeys(
+        ["summer", "summertime", "samba", "cafe", "rock"], 100.0
+    )